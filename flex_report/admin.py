@@ -3,6 +3,8 @@ from django.contrib import admin
 from .app_settings import app_settings
 from .models import (
     Column,
+    ExportCacheEntry,
+    ExportJob,
     TableButton,
     TableButtonColor,
     TablePage,
@@ -10,5 +12,5 @@ from .models import (
     TemplateSavedFilter,
 )
 
-for model in [Column, TableButton, TableButtonColor, TablePage, Template, TemplateSavedFilter]:
+for model in [Column, TableButton, TableButtonColor, TablePage, Template, TemplateSavedFilter, ExportJob, ExportCacheEntry]:
     admin.site.register(model, app_settings.MODEL_ADMINS[model])
@@ -130,6 +130,9 @@ class AppSettings(object):
             "COLUMN_DELETE": "flex_report.views.column_delete_view",
             "REPORT": "flex_report.views.report_view",
             "REPORT_EXPORT": "flex_report.views.report_export_view",
+            "EXPORT_JOB_CREATE": "flex_report.views.export_job_create_view",
+            "EXPORT_JOB_DETAIL": "flex_report.views.export_job_detail_view",
+            "EXPORT_JOB_DOWNLOAD": "flex_report.views.export_job_download_view",
         }
         if VIEWS := self._settings("VIEWS", False):
             assert isinstance(VIEWS, dict)
@@ -141,10 +144,46 @@ class AppSettings(object):
     def REALTIME_QUICKSEARCH(self):
         return self._settings("REALTIME_QUICKSEARCH", True)
 
+    @property
+    def QUICKSEARCH_BACKEND(self):
+        return import_callable(self._settings("QUICKSEARCH_BACKEND", "flex_report.search.IContainsQuicksearchBackend"))
+
     @property
     def MODEL_EXPORT_KWARGS_FUNC_NAME(self):
         return self._settings("MODEL_EXPORT_KWARGS_FUNC_NAME", "flex_export_kwargs")
 
+    @property
+    def PAGINATION_MODE(self):
+        return self._settings("PAGINATION_MODE", "offset")
+
+    @property
+    def PAGINATION_COUNT_ESTIMATE_THRESHOLD(self):
+        return self._settings("PAGINATION_COUNT_ESTIMATE_THRESHOLD", 100_000)
+
+    @property
+    def EXPORT_JOB_TIMEOUT(self):
+        return self._settings("EXPORT_JOB_TIMEOUT", 60 * 60)
+
+    @property
+    def EXPORT_CACHE_ENABLED(self):
+        return self._settings("EXPORT_CACHE_ENABLED", False)
+
+    @property
+    def EXPORT_CACHE_TTL(self):
+        return self._settings("EXPORT_CACHE_TTL", 60 * 60)
+
+    @property
+    def EXPORT_CACHE_MAX_SIZE(self):
+        return self._settings("EXPORT_CACHE_MAX_SIZE", 1024**3)
+
+    @property
+    def EXPORT_CONTENT_ENCODING(self):
+        return self._settings("EXPORT_CONTENT_ENCODING", False)
+
+    @property
+    def MODEL_CACHE_MARKER_FUNC_NAME(self):
+        return self._settings("MODEL_CACHE_MARKER_FUNC_NAME", "flex_cache_marker")
+
     @property
     def MODEL_ADMINS(self):
         dflt = model_admins = {
@@ -154,6 +193,8 @@ class AppSettings(object):
             "TablePage": "flex_report.defaults.admin.TablePageAdmin",
             "TableButtonColor": "flex_report.defaults.admin.TableButtonColorAdmin",
             "TemplateSavedFilter": "flex_report.defaults.admin.TemplateSavedFilterAdmin",
+            "ExportJob": "flex_report.defaults.admin.ExportJobAdmin",
+            "ExportCacheEntry": "flex_report.defaults.admin.ExportCacheEntryAdmin",
         }
         if ADMINS := self._settings("MODEL_ADMINS", False):
             assert isinstance(ADMINS, dict)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ReportConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "flex_report"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import tempfile
+from datetime import timedelta
+from functools import partial
+from logging import getLogger
+
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+
+from .app_settings import app_settings
+from .models import ExportCacheEntry
+from .utils import ObjectEncoder
+
+logger = getLogger(__name__)
+
+
+class CacheKeyEncoder(ObjectEncoder):
+    def default(self, obj):
+        try:
+            return super().default(obj)
+        except TypeError:
+            return str(obj)
+
+
+def is_indexed(model, field):
+    """Returns whether `field` leads an index of `model`, which makes its maximum a lookup instead of a scan."""
+    if field.primary_key or field.unique or field.db_index:
+        return True
+    return any(index.fields and index.fields[0].lstrip("-") == field.name for index in model._meta.indexes)
+
+
+def get_data_marker(model):
+    """
+    Returns a cheap marker of the latest change to the rows of `model`, checked on every cached export.
+    Models can provide their own through a `flex_cache_marker` classmethod;
+    otherwise the highest primary key is used, which catches inserts, along with the latest value
+    of the model's indexed `auto_now` fields, which catches updates. Unindexed ones would be a scan of the table.
+    Deletions and changes to related rows are left to the TTL.
+    """
+    if marker := getattr(model, app_settings.MODEL_CACHE_MARKER_FUNC_NAME, None):
+        return marker()
+
+    aggregates = {
+        field.name: Max(field.name)
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) and is_indexed(model, field)
+    }
+    return model._base_manager.aggregate(pk__max=Max("pk"), **aggregates)
+
+
+def get_export_cache_key(*parts):
+    data = json.dumps(parts, cls=CacheKeyEncoder, sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def get_cache_expiry():
+    return timezone.now() - timedelta(seconds=app_settings.EXPORT_CACHE_TTL)
+
+
+def get_cached_export(key):
+    """Returns the live cache entry of `key` and records the hit, or None on a miss."""
+    entry = ExportCacheEntry.objects.filter(key=key, created__gte=get_cache_expiry()).first()
+    if not entry:
+        return None
+
+    if not entry.file.storage.exists(entry.file.name):
+        delete_export_cache_entries([entry])
+        return None
+
+    ExportCacheEntry.objects.filter(pk=entry.pk).update(hits=F("hits") + 1, last_accessed=timezone.now())
+    return entry
+
+
+def delete_export_cache_entries(entries):
+    for entry in entries:
+        entry.file.delete(save=False)
+        entry.delete()
+
+
+def evict_export_cache():
+    """
+    Removes the entries older than the TTL, then the least recently accessed ones
+    until the cache fits in `EXPORT_CACHE_MAX_SIZE` bytes.
+    """
+    delete_export_cache_entries(ExportCacheEntry.objects.filter(created__lt=get_cache_expiry()))
+
+    max_size = app_settings.EXPORT_CACHE_MAX_SIZE
+    total_size = ExportCacheEntry.objects.aggregate(total=Sum("size"))["total"] or 0
+    if total_size <= max_size:
+        return
+
+    for entry in ExportCacheEntry.objects.order_by("last_accessed").iterator():
+        if total_size <= max_size:
+            break
+        total_size -= entry.size
+        delete_export_cache_entries([entry])
+
+
+def store_export(key, template, export_format, filename, output):
+    delete_export_cache_entries(ExportCacheEntry.objects.filter(key=key))
+
+    entry = ExportCacheEntry(
+        key=key,
+        template=template,
+        export_format=export_format,
+        size=output.size,
+        last_accessed=timezone.now(),
+    )
+    entry.file.save(filename, output, save=False)
+    try:
+        with transaction.atomic():
+            entry.save()
+    except IntegrityError:
+        # another request stored the same export in the meantime
+        entry.file.delete(save=False)
+        return None
+
+    evict_export_cache()
+    return entry
+
+
+def _tee_streaming_content(chunks, store):
+    with tempfile.TemporaryFile() as output:
+        for chunk in chunks:
+            output.write(chunk)
+            yield chunk
+
+        output.seek(0)
+        try:
+            store(File(output))
+        except Exception:
+            logger.exception("Storing the export in the cache failed")
+
+
+def cache_export_response(response, key, template, export_format, filename):
+    """
+    Stores the export served by `response` under `key`.
+    Streaming responses are written to the cache as they are sent, and only stored once complete.
+    """
+    if response.status_code != 200:
+        return response
+
+    store = partial(store_export, key, template, export_format, filename)
+    if response.streaming:
+        response.streaming_content = _tee_streaming_content(response.streaming_content, store)
+    else:
+        store(ContentFile(response.content))
+    return response
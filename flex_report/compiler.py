@@ -0,0 +1,300 @@
+import datetime
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, List, Optional
+
+import jdatetime
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+from django_filters.utils import LOOKUP_SEP, get_model_field
+from djmoney.models import fields as money_fields
+from phonenumber_field.modelfields import PhoneNumberField
+
+from .app_settings import app_settings
+from .constants import DynamicSubField
+from .dates import format_jalali, format_jalali_many
+from .fields import FieldFileAbsoluteURL
+from .registry import get_time_formats
+
+
+@dataclass(frozen=True)
+class CompiledColumn:
+    """
+    A column whose field lookup, attribute path and formatting rules are resolved once,
+    so that evaluating it for a row is a matter of calling prebuilt callables.
+    `cell` returns the display string of the column, and `value` returns its native value.
+    When the column is a plain database field, `path` is the lookup that fetches its raw value
+    with `values_list`, and `format_cell` / `format_value` format such raw values.
+    `accessor` returns the raw value of a model column from an object, before any formatting,
+    and `format_cells` formats a list of raw values at once, converting each distinct date only once.
+    """
+
+    name: Any
+    field: Any
+    cell: Callable
+    value: Callable
+    path: Optional[str] = None
+    format_cell: Optional[Callable] = None
+    format_value: Optional[Callable] = None
+    accessor: Optional[Callable] = None
+    format_cells: Optional[Callable] = None
+
+
+def compile_accessor(name):
+    """Returns a callable that follows the `__` separated attribute path of `name` on an object."""
+    parts = tuple(name.split(LOOKUP_SEP))
+    if len(parts) == 1:
+        return lambda obj: getattr(obj, name, None)
+
+    def accessor(obj):
+        for part in parts:
+            obj = getattr(obj, part, None)
+        return obj
+
+    return accessor
+
+
+def _compile_choices(field):
+    choices = dict(field.flatchoices)
+
+    def display(attr):
+        try:
+            return choices.get(attr, attr)
+        except TypeError:
+            return attr
+
+    return display
+
+
+def _compile_converter(field, absolute_url, *, typed=False):
+    """
+    Returns the field-specific conversion applied to a raw value,
+    mirroring the rules `get_column_cell` has always applied.
+    With `typed`, values that have a native representation (money, files) are left as objects.
+    """
+    if field is None:
+        return None
+
+    if getattr(field, "one_to_many") or getattr(field, "many_to_many"):
+        return lambda attr: attr and ", ".join(map(str, attr.all()))
+    if field.choices:
+        return _compile_choices(field)
+    if isinstance(field, money_fields.MoneyField):
+        return None if typed else str
+    if isinstance(field, (models.FileField, models.ImageField)):
+        if typed:
+            return lambda attr: FieldFileAbsoluteURL(file=attr, absolute=absolute_url)
+        return lambda attr: FieldFileAbsoluteURL(file=attr, absolute=absolute_url).url
+    if isinstance(field, PhoneNumberField):
+        return lambda attr: str(attr).replace(" ", "-")
+    return None
+
+
+def _compile_cell(field, absolute_url):
+    default = app_settings.DEFAULT_CELL_VALUE
+    time_format = field is not None and get_time_formats().get(type(field))
+    converter = _compile_converter(field, absolute_url)
+
+    def format_cell(attr):
+        if isinstance(attr, bool):
+            return attr
+
+        if time_format and isinstance(attr, datetime.datetime):
+            attr = format_jalali(attr, time_format)
+        elif time_format and isinstance(attr, jdatetime.datetime):
+            attr = attr.strftime(time_format)
+        elif converter is not None:
+            attr = converter(attr)
+
+        return (attr and str(attr)) or default
+
+    return format_cell
+
+
+def _compile_cells(field, format_cell):
+    time_format = field is not None and get_time_formats().get(type(field))
+    if not time_format:
+        return lambda values: [format_cell(attr) for attr in values]
+
+    return lambda values: [
+        format_cell(attr) for attr in format_jalali_many(values, time_format, types=datetime.datetime)
+    ]
+
+
+def _compile_value(field, absolute_url):
+    time_format = field is not None and get_time_formats().get(type(field))
+    converter = _compile_converter(field, absolute_url, typed=True)
+
+    def format_value(attr):
+        if attr is None or isinstance(attr, bool):
+            return attr
+
+        if time_format and isinstance(attr, (jdatetime.datetime, jdatetime.date)):
+            attr = attr.strftime(time_format)
+        elif converter is not None:
+            attr = converter(attr)
+
+        if isinstance(attr, models.Model):
+            return str(attr)
+        return attr
+
+    return format_value
+
+
+def get_values_path(model, name):
+    """
+    Returns `name` if the column can be fetched with `values_list` instead of model instances,
+    that is, it follows single-valued relations to a concrete, non-relational field
+    whose database value is what the model instance would hold.
+    """
+    *relations, field_name = name.split(LOOKUP_SEP)
+    try:
+        for relation in relations:
+            field = model._meta.get_field(relation)
+            if not (field.is_relation and (field.many_to_one or field.one_to_one)):
+                return None
+            model = field.related_model
+        field = model._meta.get_field(field_name)
+    except FieldDoesNotExist:
+        return None
+
+    if field.is_relation or not field.concrete:
+        return None
+    if isinstance(field, (money_fields.MoneyField, models.FileField)):
+        return None
+    if not (
+        isinstance(getattr(model, field.attname, None), DeferredAttribute)
+        or hasattr(field, "from_db_value")
+    ):
+        return None
+    return name
+
+
+def get_related_lookups(model, paths):
+    """
+    Takes in a model and column paths, and returns a tuple of the `select_related` and
+    `prefetch_related` lookups needed to evaluate those paths without a query per row.
+    Single-valued relations are joined, and the path from the first to-many relation on is prefetched.
+    """
+    select_related, prefetch_related = set(), set()
+
+    for path in paths:
+        if not isinstance(path, str):
+            continue
+
+        parts = path.split(LOOKUP_SEP)
+        current, relations, many = model, [], False
+        for part in parts:
+            try:
+                field = current._meta.get_field(part)
+            except FieldDoesNotExist:
+                break
+            if not field.is_relation or not field.related_model:
+                break
+
+            relations.append(part)
+            many = many or field.one_to_many or field.many_to_many
+            if not many:
+                select_related.add(LOOKUP_SEP.join(relations))
+            current = field.related_model
+
+        if many:
+            prefetch_related.add(LOOKUP_SEP.join(relations))
+
+    return (
+        [p for p in select_related if not any(o.startswith(f"{p}{LOOKUP_SEP}") for o in select_related)],
+        [p for p in prefetch_related if not any(o.startswith(f"{p}{LOOKUP_SEP}") for o in prefetch_related)],
+    )
+
+
+@lru_cache(maxsize=None)
+def compile_column(model, name, absolute_url=True):
+    """
+    Compiles the column `name` of `model` into a `CompiledColumn`.
+    The result is cached per model and column, so the field lookups happen only once per process.
+    """
+    field = get_model_field(model, name) if model else None
+    accessor = compile_accessor(name)
+    format_cell = _compile_cell(field, absolute_url)
+    format_value = _compile_value(field, absolute_url)
+    return CompiledColumn(
+        name=name,
+        field=field,
+        cell=lambda obj: format_cell(accessor(obj)),
+        value=lambda obj: format_value(accessor(obj)),
+        path=get_values_path(model, name) if model else None,
+        format_cell=format_cell,
+        format_value=format_value,
+        accessor=accessor,
+        format_cells=_compile_cells(field, format_cell),
+    )
+
+
+def _get_model(obj):
+    return obj._meta.model if hasattr(obj, "_meta") else None
+
+
+def get_cell(obj, name, *, absolute_url=True):
+    if isinstance(name, DynamicSubField):
+        return name.get_value(obj)
+
+    if callable(name):
+        return name(obj, name)
+
+    if isinstance(obj, dict):
+        return obj.get(name, app_settings.DEFAULT_CELL_VALUE)
+
+    return compile_column(_get_model(obj), name, absolute_url).cell(obj)
+
+
+def get_value(obj, name, *, absolute_url=True):
+    if isinstance(name, DynamicSubField):
+        return name.get_value(obj)
+
+    if callable(name):
+        return name(obj, name)
+
+    if isinstance(obj, dict):
+        return obj.get(name)
+
+    return compile_column(_get_model(obj), name, absolute_url).value(obj)
+
+
+def _compile_dynamic_column(name, absolute_url):
+    return CompiledColumn(
+        name=name,
+        field=None,
+        cell=lambda obj: get_cell(obj, name, absolute_url=absolute_url),
+        value=lambda obj: get_value(obj, name, absolute_url=absolute_url),
+    )
+
+
+def compile_columns(model, columns, *, absolute_url=True) -> List[CompiledColumn]:
+    """
+    Compiles a list of columns, as found in export headers or template columns, for the given model.
+    Dynamic sub-fields and callables, as well as columns of an unknown model, are resolved per row.
+    """
+    return [
+        compile_column(model, column, absolute_url)
+        if model and isinstance(column, str)
+        else _compile_dynamic_column(column, absolute_url)
+        for column in columns
+    ]
+
+
+def get_values_paths(compiled_columns):
+    """
+    Returns the `values_list` lookups of the given columns,
+    or None if any of them needs a model instance to be evaluated.
+    """
+    paths = [column.path for column in compiled_columns]
+    return paths if paths and all(paths) else None
+
+
+def get_row_cells(obj, compiled_columns):
+    return [column.cell(obj) for column in compiled_columns]
+
+
+def get_row_values(obj, compiled_columns):
+    return [column.value(obj) for column in compiled_columns]
@@ -0,0 +1,57 @@
+import contextlib
+import zlib
+from dataclasses import dataclass
+from typing import Callable
+
+zstandard = None
+with contextlib.suppress(ImportError):
+    import zstandard
+
+
+@dataclass(frozen=True)
+class Compression:
+    name: str
+    ext: str
+    content_type: str
+    compressobj: Callable
+
+    def compress(self, chunks):
+        """Compresses an iterable of chunks incrementally, yielding data as soon as the compressor emits it."""
+        compressor = self.compressobj()
+        for chunk in chunks:
+            if data := compressor.compress(chunk):
+                yield data
+        yield compressor.flush()
+
+
+compressions = {
+    "gzip": Compression(
+        name="gzip",
+        ext=".gz",
+        content_type="application/gzip",
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        compressobj=lambda: zlib.compressobj(6, zlib.DEFLATED, 31),
+    ),
+}
+
+if zstandard is not None:
+    compressions["zstd"] = Compression(
+        name="zstd",
+        ext=".zst",
+        content_type="application/zstd",
+        compressobj=lambda: zstandard.ZstdCompressor(level=3).compressobj(),
+    )
+
+
+def get_accepted_encodings(accept_encoding):
+    """Returns the encodings an `Accept-Encoding` header accepts, leaving out those with a zero quality."""
+    encodings = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = params.strip().removeprefix("q=")
+        with contextlib.suppress(ValueError):
+            if params and float(quality) == 0:
+                continue
+        if name := name.strip().lower():
+            encodings.add(name)
+    return encodings
@@ -1,9 +1,13 @@
 import datetime
+import tempfile
 from abc import abstractmethod
+from itertools import islice
 from typing import List
 
 import django_filters
 import xlwt
+from django.db.models import QuerySet
+from django.db.models.query import ModelIterable
 
 from .fields import FieldFileAbsoluteURL
 
@@ -90,6 +94,13 @@ class BaseExportFormat:
     export_qs = []
     export_kwargs = {}
     export_filename = None
+    streaming = False
+    compressible = False
+    shardable = False
+    include_header = True
+    chunk_size = 2000
+    read_chunk_size = 64 * 1024
+    progress_callback = None
 
     def __init__(self, user=None, request=None):
         self.user = user
@@ -107,6 +118,81 @@ class BaseExportFormat:
     def get_export_qs(self):
         return self.export_qs
 
+    def get_export_model(self):
+        """Returns the model of the exported rows, or None when they aren't model instances."""
+        queryset = self.get_export_qs()
+        if isinstance(queryset, QuerySet) and issubclass(queryset._iterable_class, ModelIterable):
+            return queryset.model
+        return None
+
+    def get_chunk_size(self):
+        return self.get_export_kwargs().get("chunk_size", self.chunk_size)
+
+    def iter_export_qs(self, values_list=None):
+        """
+        Iterates over the export queryset without caching its results,
+        fetching the rows from the database `chunk_size` at a time.
+        If `values_list` is given, rows are fetched as tuples of those lookups.
+        """
+        queryset = self.get_export_qs()
+        if isinstance(queryset, QuerySet):
+            if values_list:
+                queryset = queryset.prefetch_related(None).values_list(*values_list)
+            rows = queryset.iterator(chunk_size=self.get_chunk_size())
+        else:
+            rows = iter(queryset)
+
+        if self.progress_callback is None:
+            return rows
+        return self._track_progress(rows)
+
+    def _track_progress(self, rows):
+        chunk_size = self.get_chunk_size()
+        num = 0
+        for num, row in enumerate(rows, start=1):
+            yield row
+            if num % chunk_size == 0:
+                self.progress_callback(num)
+        self.progress_callback(num)
+
+    def iter_export_rows(self, compiled_columns, *, typed=False, with_objects=False):
+        """
+        Yields the exported rows as `(obj, cells)` pairs, where cells are the display strings
+        of the compiled columns, or their native values with `typed`.
+        When every column is a plain database field and `with_objects` isn't requested,
+        the rows are fetched with a single `values_list` query instead of model instances, and `obj` is None.
+        """
+        paths = [column.path for column in compiled_columns]
+        if not with_objects and self.get_export_model() and paths and all(paths):
+            formatters = [column.format_value if typed else column.format_cell for column in compiled_columns]
+            for _, *values in self.iter_export_qs(values_list=["pk", *paths]):
+                yield None, [format_(value) for format_, value in zip(formatters, values)]
+            return
+
+        getters = [column.value if typed else column.cell for column in compiled_columns]
+        for obj in self.iter_export_qs():
+            yield obj, [get(obj) for get in getters]
+
+    def iter_export_columns(self, compiled_columns):
+        """
+        Yields the exported rows `chunk_size` at a time, transposed into a list of native values per column,
+        which is the shape columnar writers consume.
+        """
+        rows = (values for _, values in self.iter_export_rows(compiled_columns, typed=True))
+        while chunk := list(islice(rows, self.get_chunk_size())):
+            yield [list(values) for values in zip(*chunk)]
+
+    def iter_file_chunks(self, write):
+        """
+        Calls `write` with a temporary binary file, then yields the written file as chunks of bytes.
+        Meant for writers that need a real file instead of an iterable of chunks.
+        """
+        with tempfile.TemporaryFile() as output:
+            write(output)
+            output.seek(0)
+            while chunk := output.read(self.read_chunk_size):
+                yield chunk
+
     def check_auth(self):
         return True
 
@@ -131,6 +217,14 @@ class BaseExportFormat:
     def handle_response(self, *args, **kwargs):
         raise NotImplementedError
 
+    def iter_chunks(self):
+        """
+        Yields the exported file as chunks of bytes.
+        Formats that set `streaming` are served through this method
+        instead of `handle_response`.
+        """
+        raise NotImplementedError
+
 
 class FieldTypes:
     field = "field"
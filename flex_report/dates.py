@@ -0,0 +1,76 @@
+import datetime
+import re
+from functools import lru_cache
+
+import jdatetime
+
+JALALI_CACHE_SIZE = 2**16
+
+# directives whose output doesn't depend on the calendar beyond the date numbers substituted below
+FAST_DIRECTIVES = frozenset("YymdHIMSfZ%")
+DIRECTIVE_RE = re.compile(r"%(.)")
+DATE_DIRECTIVE_RE = re.compile(r"%[Yymd%]")
+
+
+@lru_cache(maxsize=JALALI_CACHE_SIZE)
+def gregorian_to_jalali_date(date):
+    return jdatetime.date.fromgregorian(date=date)
+
+
+@lru_cache(maxsize=None)
+def _is_fast_format(time_format):
+    return set(DIRECTIVE_RE.findall(time_format)) <= FAST_DIRECTIVES
+
+
+@lru_cache(maxsize=JALALI_CACHE_SIZE)
+def _get_jalali_format(date, time_format):
+    """Substitutes the jalali date numbers of `date` into a format, leaving the rest to `strftime`."""
+    jalali_date = gregorian_to_jalali_date(date)
+    date_parts = {
+        "%Y": f"{jalali_date.year:04d}",
+        "%y": f"{jalali_date.year % 100:02d}",
+        "%m": f"{jalali_date.month:02d}",
+        "%d": f"{jalali_date.day:02d}",
+        "%%": "%%",
+    }
+    return DATE_DIRECTIVE_RE.sub(lambda m: date_parts[m.group()], time_format)
+
+
+@lru_cache(maxsize=JALALI_CACHE_SIZE)
+def _format_jalali(value, tzinfo, time_format):
+    if isinstance(value, datetime.datetime):
+        return jdatetime.datetime.fromgregorian(datetime=value).strftime(time_format)
+    return gregorian_to_jalali_date(value).strftime(time_format)
+
+
+def format_jalali(value, time_format):
+    """
+    Formats a gregorian date or datetime as a jalali one with the given `strftime` format.
+    The jalali date of a day is computed once, and formats made of numeric directives
+    are then rendered by the C `strftime`. Other formats are cached per value, time zone and format.
+    """
+    if _is_fast_format(time_format):
+        date = value.date() if isinstance(value, datetime.datetime) else value
+        return value.strftime(_get_jalali_format(date, time_format))
+
+    # aware datetimes of the same instant are equal, but don't format the same in different zones
+    return _format_jalali(value, getattr(value, "tzinfo", None), time_format)
+
+
+def format_jalali_many(values, time_format, *, types=(datetime.datetime, datetime.date)):
+    """
+    Formats a column of values, converting each distinct date of `types` once.
+    Other values are returned as they are.
+    """
+    formatted = {}
+    results = []
+    for value in values:
+        if not isinstance(value, types):
+            results.append(value)
+            continue
+
+        key = (value, getattr(value, "tzinfo", None))
+        if key not in formatted:
+            formatted[key] = format_jalali(value, time_format)
+        results.append(formatted[key])
+    return results
@@ -7,6 +7,8 @@ from django.utils.html import format_html
 
 from ..models import (
     Column,
+    ExportCacheEntry,
+    ExportJob,
     TableButton,
     TableButtonColor,
     TablePage,
@@ -129,3 +131,48 @@ class TemplateSavedFilterAdmin(admin.ModelAdmin):
         TemplateSavedFilter.title.field.name,
         fields_join(TemplateSavedFilter.template.field.name, Template.title.field.name),
     ]
+
+
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = [
+        ExportJob.template.field.name,
+        ExportJob.export_format.field.name,
+        ExportJob.status.field.name,
+        ExportJob.progress.field.name,
+        ExportJob.row_count.field.name,
+        ExportJob.creator.field.name,
+        ExportJob.created.field.name,
+        ExportJob.finished.field.name,
+    ]
+    raw_id_fields = [
+        ExportJob.template.field.name,
+        ExportJob.creator.field.name,
+    ]
+    list_filter = [
+        ExportJob.status.field.name,
+        ExportJob.export_format.field.name,
+    ]
+    search_fields = [
+        fields_join(ExportJob.template.field.name, Template.title.field.name),
+    ]
+
+
+class ExportCacheEntryAdmin(admin.ModelAdmin):
+    list_display = [
+        ExportCacheEntry.template.field.name,
+        ExportCacheEntry.export_format.field.name,
+        ExportCacheEntry.size.field.name,
+        ExportCacheEntry.hits.field.name,
+        ExportCacheEntry.created.field.name,
+        ExportCacheEntry.last_accessed.field.name,
+    ]
+    raw_id_fields = [
+        ExportCacheEntry.template.field.name,
+    ]
+    list_filter = [
+        ExportCacheEntry.export_format.field.name,
+    ]
+    search_fields = [
+        ExportCacheEntry.key.field.name,
+        fields_join(ExportCacheEntry.template.field.name, Template.title.field.name),
+    ]
@@ -1,12 +1,13 @@
 import contextlib
+import os
 from collections import OrderedDict
 
 from django.shortcuts import  get_object_or_404
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
 from django.db import transaction
-from django.http import Http404
-from django.shortcuts import redirect
+from django.http import FileResponse, Http404, HttpResponseBadRequest
+from django.shortcuts import redirect, render
 from django.urls import reverse, reverse_lazy
 from django.views import View
 from django.views.generic.detail import DetailView, SingleObjectMixin
@@ -20,7 +21,9 @@ from django.views.generic.edit import (
 )
 from django.views.generic.list import ListView
 
+from .. import export_format
 from ..app_settings import app_settings
+from ..cache import cache_export_response, get_cached_export, get_data_marker, get_export_cache_key
 from ..choices import TemplateTypeChoices
 from ..filterset import generate_filterset_from_model
 from ..forms import (
@@ -29,8 +32,10 @@ from ..forms import (
     generate_report_saved_filter_form,
     generate_template_create_form,
 )
+from ..jobs import build_export_view, enqueue_export_job
 from ..mixins import QuerySetExportMixin, TablePageMixin, TemplateObjectMixin
-from ..models import Column, Template, TemplateSavedFilter
+from ..models import Column, ExportJob, Template, TemplateSavedFilter
+from ..plan import get_plan_headers
 from ..templatetags.flex_report_filters import get_column_verbose_name
 from ..utils import (
     FieldTypes,
@@ -335,6 +340,10 @@ class ReportViewBase(TablePageMixin, BaseView, DetailView):
     model = Template
     is_page_table = False
 
+    def get_object(self):
+        # the template is looked up by the setup, the saved filters and the detail view alike
+        return self.memoize("object", super().get_object)
+
     def get_template(self) -> Template:
         return self.get_object()
 
@@ -353,13 +362,16 @@ class GeneralQuerySetExportView(QuerySetExportMixin):
 
 
 class ReportExportView(QuerySetExportMixin, ReportViewBase):
-    def get(self, *args, **kwargs):
+    def prepare_export(self):
         self.export_filename = get_report_filename(self.template_object)
 
         columns = OrderedDict()
+        column_types = {col["title"]: col["type"] for col in self.template_plan["columns"]}
+        headers = get_plan_headers(self.template_plan) or {}
         for col in self.template_columns:
-            if get_column_type(self.report_model, col.title) != FieldTypes.dynamic:
-                columns[col.title] = str(
+            column_type = column_types.get(col.title) or get_column_type(self.report_model, col.title)
+            if column_type != FieldTypes.dynamic:
+                columns[col.title] = headers.get(col.title) or str(
                     get_column_verbose_name(self.report_model, col.title)
                 )
                 continue
@@ -378,10 +390,106 @@ class ReportExportView(QuerySetExportMixin, ReportViewBase):
             lambda *args, **kwargs: {},
         )()
 
+    def get_export_cache_key(self):
+        initials = self.get_initials()
+        initials.pop("format", None)
+        initials.pop(self.compression_keyword, None)
+        return get_export_cache_key(
+            self.template_object.pk,
+            self.template_object.modified_date,
+            # labels aren't unique and column changes don't touch the template's modified date
+            [[str(column), label] for column, label in self.export_headers.items()],
+            {
+                "template": self.template_object.filters,
+                "saved": getattr(self.get_saved_filter(), "filters", {}),
+                "request": initials,
+            },
+            self.get_user_path_scope(),
+            self.export_format,
+            get_data_marker(self.report_model),
+        )
+
+    def get_export_response(self, exporter):
+        if not app_settings.EXPORT_CACHE_ENABLED:
+            return super().get_export_response(exporter)
+
+        cache_key = self.get_export_cache_key()
+        if entry := get_cached_export(cache_key):
+            return FileResponse(
+                entry.file.open("rb"),
+                as_attachment=True,
+                filename=str(exporter.get_export_filename()),
+                content_type=self.get_content_type(exporter),
+            )
+
+        return cache_export_response(
+            super().get_export_response(exporter),
+            cache_key,
+            self.template_object,
+            self.export_format,
+            f"{cache_key}{exporter.format_ext}",
+        )
+
+    def get(self, *args, **kwargs):
+        self.prepare_export()
         return super().get(*args, **kwargs)
 
+    def check_access(self):
+        """Makes the checks `dispatch` does, for exports that are built outside of a request, like export jobs."""
+        if not self.template_object:
+            raise PermissionDenied
+        if self.template_object.status != Template.Status.complete:
+            self.template_not_ready()
+        self.check_auth()
+
     def get_export_qs(self):
         return self.get_report_qs()
 
     def template_not_ready(self):
         raise Http404
+
+
+class ExportJobCreateView(BaseView, SingleObjectMixin, View):
+    model = Template
+    # jobs are only enqueued through CSRF-protected posts, never by following a link
+    http_method_names = ["post"]
+    template_name = "flex_report/export_job.html"
+    ignored_params = ["format", "csrfmiddlewaretoken"]
+
+    def post(self, *args, **kwargs):
+        self.object = self.get_object()
+        if not self.object.has_export:
+            raise PermissionDenied
+
+        if (format_ := self.request.POST.get("format", "").lower()) not in export_format.formats:
+            return HttpResponseBadRequest()
+
+        query_params = {k: v for k, v in self.request.POST.lists() if k not in self.ignored_params}
+        # refuses what the export view would, before the job is queued
+        build_export_view(self.object, self.request.user, query_params, format_)
+        job = enqueue_export_job(self.object, self.request.user, format_, query_params)
+        return render(self.request, self.template_name, {"object": job})
+
+
+class ExportJobDetailView(BaseView, DetailView):
+    model = ExportJob
+    template_name = "flex_report/export_job.html"
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.request.user.is_superuser:
+            return qs
+        return qs.filter(creator=self.request.user)
+
+
+class ExportJobDownloadView(ExportJobDetailView):
+    def get(self, *args, **kwargs):
+        job = self.get_object()
+        if job.status != ExportJob.Status.complete or not job.file:
+            raise Http404
+
+        return FileResponse(
+            job.file.open("rb"),
+            as_attachment=True,
+            filename=os.path.basename(job.file.name),
+        )
@@ -1,4 +1,6 @@
-from functools import reduce
+import json
+from dataclasses import dataclass
+from functools import lru_cache, reduce
 from operator import or_
 
 import django_filters
@@ -6,11 +8,14 @@ from django_filters.filters import LOOKUP_SEP
 from django_filters import FilterSet as BaseFilterSetBase
 
 from django_filters.conf import DEFAULTS
+from django_filters.constants import EMPTY_VALUES
 from django import forms
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 from .app_settings import app_settings
+from .search import get_quicksearch_backend
 from .utils import (
     generate_filterset_form,
     get_fields_lookups,
@@ -121,11 +126,7 @@ class QuicksearchFilterset(FilterSet):
     def quick_search(self, queryset, name, value):
         if not value.strip():
             return queryset
-        fields = self.Meta.searchable_fields or []
-        q_object = reduce(
-            or_, [(Q(**{f"{field}__icontains": value})) for field in fields]
-        )
-        return queryset.filter(q_object) if q_object else queryset.none()
+        return get_quicksearch_backend().search(queryset, self.Meta.searchable_fields or [], value)
 
     @classmethod
     def get_fields(cls):
@@ -136,21 +137,96 @@ class QuicksearchFilterset(FilterSet):
         return super(FilterSet, cls).get_fields()
 
 
-def generate_quicksearch_filterset_from_model(model, fields=[], form_classes=None):
+@lru_cache(maxsize=None)
+def _build_quicksearch_filterset(model, fields, form_classes):
     return type(
         f"{getattr(model, '__name__', '')}DynamicQuicksearchFilterset",
         (QuicksearchFilterset,),
-        {"Meta": FilterSetMeta(model, fields), "form_classes": form_classes},
+        {"Meta": FilterSetMeta(model, list(fields)), "form_classes": form_classes and list(form_classes)},
     )
 
 
-def generate_filterset_from_model(model, form_classes=None):
-    if form_classes is None:
-        form_classes = []
-
+@lru_cache(maxsize=None)
+def _build_filterset(model, form_classes, filterset_class):
     return type(
         f"{getattr(model, '__name__', '')}DynamicFilterSet",
-        (app_settings.FILTERSET_CLASS,),
-        {"Meta": FilterSetMeta(model), "form_classes": form_classes},
+        (filterset_class,),
+        {"Meta": FilterSetMeta(model), "form_classes": list(form_classes)},
     )
 
+
+def generate_quicksearch_filterset_from_model(model, fields=[], form_classes=None):
+    """Returns the quicksearch filterset of `model`, built once per searchable fields and form classes."""
+    return _build_quicksearch_filterset(model, tuple(fields), form_classes and tuple(form_classes))
+
+
+def generate_filterset_from_model(model, form_classes=None):
+    """
+    Returns the filterset of `model`, built once per form classes, since building one
+    resolves the lookups and filters of every field of the model.
+    """
+    return _build_filterset(model, tuple(form_classes or []), app_settings.FILTERSET_CLASS)
+
+
+@dataclass(frozen=True)
+class StoredFilters:
+    """
+    Stored filter data compiled to the Q objects its filters apply, each meant for its own `filter()` call.
+    `conditions` is None when a filter can't be expressed as Q objects and the filterset has to be applied.
+    """
+
+    conditions: tuple | None
+    is_valid: bool
+
+
+def filter_to_conditions(filter_, value):
+    """Returns the Q objects `filter_` filters `value` with, or None for filters that filter otherwise."""
+    if filter_.method is not None:
+        return None
+
+    match type(filter_).filter:
+        case django_filters.Filter.filter | django_filters.ChoiceFilter.filter:
+            if isinstance(filter_, django_filters.ChoiceFilter) and value == filter_.null_value:
+                value = None
+            elif value in EMPTY_VALUES:
+                return []
+            conditions = [Q(**{LOOKUP_SEP.join([filter_.field_name, filter_.lookup_expr]): value})]
+        case django_filters.MultipleChoiceFilter.filter:
+            if not value or filter_.is_noop(None, value):
+                return []
+            conditions = [
+                Q(**filter_.get_filter_predicate(None if v == filter_.null_value else v)) for v in set(value)
+            ]
+            if not filter_.conjoined:
+                conditions = [reduce(or_, conditions)]
+        case _:
+            return None
+
+    return [~q for q in conditions] if filter_.exclude else conditions
+
+
+@lru_cache(maxsize=1024)
+def _compile_stored_filters(filterset_class, data):
+    filterset = filterset_class(json.loads(data))
+    is_valid = filterset.is_valid()
+
+    conditions = []
+    for name, value in filterset.form.cleaned_data.items():
+        if (filter_conditions := filter_to_conditions(filterset.filters[name], value)) is None:
+            return StoredFilters(None, is_valid)
+        conditions.extend(filter_conditions)
+    return StoredFilters(tuple(conditions), is_valid)
+
+
+def compile_stored_filters(filterset_class, data):
+    """
+    Validates stored filter data, like the filters of a template, once per filterset and data
+    and returns the conditions it filters with, so that replaying it doesn't validate a form again.
+    """
+    return _compile_stored_filters(filterset_class, json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder))
+
+
+def clear_filterset_cache():
+    _build_quicksearch_filterset.cache_clear()
+    _build_filterset.cache_clear()
+    _compile_stored_filters.cache_clear()
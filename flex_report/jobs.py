@@ -0,0 +1,129 @@
+import tempfile
+import traceback
+from datetime import timedelta
+from logging import getLogger
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import PermissionDenied
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from .app_settings import app_settings
+from .models import ExportJob
+
+logger = getLogger(__name__)
+
+
+def build_export_view(template, user=None, query_params=None, export_format="csv"):
+    """
+    Sets up a report export view for the given template outside of the request cycle,
+    as if the user had requested the export with the given query parameters.
+    Raises `PermissionDenied` or `Http404` when the export view would refuse the request.
+    """
+    path = reverse("flex_report:template:export", kwargs={"pk": template.pk})
+    request = RequestFactory().get(path, data={**(query_params or {}), "format": export_format})
+    request.user = user or AnonymousUser()
+
+    view = app_settings.VIEWS["REPORT_EXPORT"].view_class()
+    view.setup(request, pk=template.pk)
+    view.export_format = export_format
+    view.check_access()
+    view.prepare_export()
+    return view
+
+
+def enqueue_export_job(template, user, export_format, query_params=None):
+    return ExportJob.objects.create(
+        template=template,
+        creator=user if getattr(user, "is_authenticated", False) else None,
+        export_format=export_format,
+        query_params=query_params or {},
+    )
+
+
+def claim_export_job():
+    """
+    Picks the oldest pending job and marks it as running.
+    Jobs that have been running for longer than `EXPORT_JOB_TIMEOUT` are picked again,
+    since the worker running them is assumed to have died.
+    Rows locked by other workers are skipped, so several workers can share the queue.
+    """
+    now = timezone.now()
+    stale = Q(status=ExportJob.Status.running, started__lt=now - timedelta(seconds=app_settings.EXPORT_JOB_TIMEOUT))
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=ExportJob.Status.pending) | stale)
+            .order_by("created")
+            .first()
+        )
+        if not job:
+            return None
+
+        job.status = ExportJob.Status.running
+        job.started = now
+        job.progress = job.row_count = 0
+        job.save(update_fields=["status", "started", "progress", "row_count"])
+    return job
+
+
+def _update_progress(job, row_count):
+    progress = min(100 * row_count // job.total_rows, 99) if job.total_rows else 0
+    ExportJob.objects.filter(pk=job.pk).update(row_count=row_count, progress=progress)
+
+
+def run_export_job(job):
+    try:
+        # exporting without the creator would leave the rows unscoped by its user path
+        if job.creator is None:
+            raise PermissionDenied("The creator of the export job no longer exists.")
+        view = build_export_view(
+            job.template,
+            job.creator,
+            job.query_params,
+            job.export_format,
+        )
+        exporter = view.get_exporter()
+        job.total_rows = view.get_export_qs().count()
+        ExportJob.objects.filter(pk=job.pk).update(total_rows=job.total_rows)
+        exporter.progress_callback = lambda row_count: _update_progress(job, row_count)
+
+        filename = str(exporter.get_export_filename())
+        if exporter.streaming:
+            with tempfile.TemporaryFile() as output:
+                for chunk in exporter.iter_chunks():
+                    output.write(chunk)
+                output.seek(0)
+                job.file.save(filename, File(output), save=False)
+        else:
+            response = exporter.handle_response(response=HttpResponse())
+            job.file.save(filename, ContentFile(response.content), save=False)
+    except Exception:
+        logger.exception("Export job %s failed", job.pk)
+        job.status = ExportJob.Status.failed
+        job.error = traceback.format_exc()
+        job.finished = timezone.now()
+        job.save(update_fields=["status", "error", "finished"])
+        return job
+
+    job.status = ExportJob.Status.complete
+    job.progress = 100
+    job.row_count = job.total_rows
+    job.finished = timezone.now()
+    job.save(update_fields=["status", "progress", "row_count", "file", "finished"])
+    return job
+
+
+def run_pending_export_jobs(max_jobs=None):
+    """Runs pending jobs one after another until the queue is empty or `max_jobs` are done."""
+    done = 0
+    while (max_jobs is None or done < max_jobs) and (job := claim_export_job()):
+        run_export_job(job)
+        done += 1
+    return done
@@ -0,0 +1,92 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from flex_report import BaseExportFormat
+from flex_report.models import Template
+from flex_report.sharding import run_sharded_export
+
+
+class Command(BaseCommand):
+    help = "Exports a report template in parallel, splitting its rows into primary key ranges."
+
+    def add_arguments(self, parser):
+        parser.add_argument("template_id", type=int)
+        parser.add_argument(
+            "--format",
+            dest="export_format",
+            default="csv",
+            help="The export format, which must support sharded exports.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of worker processes.",
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            default=None,
+            help="Number of primary key ranges to split the rows into. Defaults to four per worker.",
+        )
+        parser.add_argument(
+            "--user",
+            default=None,
+            help="Username whose access scope applies to the exported rows.",
+        )
+        parser.add_argument(
+            "--param",
+            action="append",
+            default=[],
+            metavar="KEY=VALUE",
+            help="A filter query parameter, as the report page would receive it. Can be repeated.",
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            default=None,
+            help="The file to write to. Defaults to the export's file name.",
+        )
+
+    def get_query_params(self, params):
+        query_params = {}
+        for param in params:
+            key, sep, value = param.partition("=")
+            if not sep:
+                raise CommandError(f"Invalid parameter '{param}', expected KEY=VALUE.")
+            query_params.setdefault(key, []).append(value)
+        return query_params
+
+    def handle(self, *args, template_id, export_format, workers, shards, user, param, output, **options):
+        if not (template := Template.objects.filter(pk=template_id).first()):
+            raise CommandError(f"Template {template_id} doesn't exist.")
+
+        if not (format_ := BaseExportFormat.formats.get(export_format.lower())):
+            raise CommandError(f"Unknown export format '{export_format}'.")
+        if not format_.shardable:
+            raise CommandError(f"The '{format_.format_slug}' format can't be exported in shards.")
+
+        if user is not None:
+            user_model = get_user_model()
+            try:
+                user = user_model.objects.get(**{user_model.USERNAME_FIELD: user})
+            except user_model.DoesNotExist as e:
+                raise CommandError(f"User '{user}' doesn't exist.") from e
+
+        filename = output or f"{template.title}{format_.format_ext}"
+        with open(filename, "wb") as file:
+            run_sharded_export(
+                template,
+                file,
+                user=user,
+                query_params=self.get_query_params(param),
+                export_format=format_.format_slug,
+                workers=workers,
+                shards=shards,
+                on_shard_done=lambda number, total: self.stderr.write(f"\rShard {number}/{total}", ending=""),
+            )
+
+        self.stderr.write("")
+        self.stdout.write(self.style.SUCCESS(f"Exported template {template.pk} to {filename}."))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from flex_report.jobs import run_pending_export_jobs
+
+
+class Command(BaseCommand):
+    help = "Runs the queued report export jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of waiting for new jobs.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2,
+            help="Seconds to wait before polling an empty queue again.",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=None,
+            help="Exit after running this many jobs.",
+        )
+
+    def handle(self, *args, once=False, sleep=2, max_jobs=None, **options):
+        done = 0
+        while max_jobs is None or done < max_jobs:
+            count = run_pending_export_jobs(None if max_jobs is None else max_jobs - done)
+            done += count
+            if count:
+                self.stdout.write(f"Ran {count} export job(s).")
+                continue
+            if once:
+                break
+            time.sleep(sleep)
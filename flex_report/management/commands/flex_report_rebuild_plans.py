@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from flex_report.models import Template
+from flex_report.plan import rebuild_template_plan
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the compiled plans of report templates. Plans follow changes to templates, columns and buttons, "
+        "but have to be rebuilt when the report models' code changes, like their fields or verbose names."
+    )
+
+    def handle(self, *args, **options):
+        count = 0
+        for template in Template.objects.select_related("model").iterator():
+            rebuild_template_plan(template)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the plans of {count} templates."))
@@ -0,0 +1,78 @@
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from flex_report import report_model
+from flex_report.models import ReportSearchDocument
+from flex_report.search import build_search_document_text, get_search_document_paths
+from flex_report.utils import get_model_manager
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the search documents of report models from their searchable columns. "
+        "Documents are kept up to date when rows are saved, but not when the related rows "
+        "their text is taken from change, nor when searchable columns are edited."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            metavar="app_label.ModelName",
+            help="The report models to rebuild. Defaults to all of them.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of rows read and documents written at a time.",
+        )
+
+    def get_models(self, labels):
+        if not labels:
+            return list(report_model.models)
+
+        models = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(f"Unknown model '{label}'.") from e
+            if model not in report_model.models:
+                raise CommandError(f"'{label}' isn't a report model.")
+            models.append(model)
+        return models
+
+    def rebuild(self, model, batch_size):
+        content_type = ContentType.objects.get_for_model(model)
+        paths = get_search_document_paths(model)
+        count = 0
+
+        with transaction.atomic():
+            ReportSearchDocument.objects.filter(content_type=content_type).delete()
+            if not paths:
+                return count
+
+            batch = []
+            for obj in get_model_manager(model).all().order_by().iterator(chunk_size=batch_size):
+                batch.append(
+                    ReportSearchDocument(
+                        content_type=content_type,
+                        object_id=str(obj.pk),
+                        text=build_search_document_text(obj, paths),
+                    )
+                )
+                if len(batch) >= batch_size:
+                    ReportSearchDocument.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch = []
+            ReportSearchDocument.objects.bulk_create(batch)
+            count += len(batch)
+        return count
+
+    def handle(self, *args, models, batch_size, **options):
+        for model in self.get_models(models):
+            count = self.rebuild(model, batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} search documents of {model._meta.label}."))
@@ -0,0 +1,77 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from flex_report.app_settings import import_callable
+from flex_report.models import Column
+from flex_report.search import get_quicksearch_backend, resolve_search_field
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates the indexes the quicksearch backend needs to search the searchable columns of every report model. "
+        "Indexes are built concurrently, so the tables stay writable meanwhile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backend",
+            default=None,
+            help="Dotted path of the quicksearch backend to create indexes for. Defaults to REPORT_QUICKSEARCH_BACKEND.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="The database to create the indexes on.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only list the indexes that would be created.",
+        )
+
+    def get_search_fields(self):
+        """Yields the distinct `(model, field)` pairs the searchable columns end on."""
+        seen = set()
+        for column in Column.objects.filter(searchable=True, column_type=Column.COLUMN_TYPES.model).select_related(
+            "model"
+        ):
+            if (model := column.model.model_class()) is None:
+                continue
+            if (resolved := resolve_search_field(model, column.title)) is None:
+                self.stderr.write(f"Skipping {model._meta.label}.{column.title}, which isn't a database field.")
+                continue
+            if resolved not in seen:
+                seen.add(resolved)
+                yield resolved
+
+    def handle(self, *args, backend, database, dry_run, **options):
+        backend = import_callable(backend)() if backend else get_quicksearch_backend()
+        connection = connections[database]
+        if connection.vendor != "postgresql":
+            raise CommandError("Search indexes can only be created on PostgreSQL.")
+
+        indexes = backend.get_indexes(self.get_search_fields())
+        if not indexes:
+            self.stdout.write("No indexes to create.")
+            return
+
+        with connection.cursor() as cursor:
+            existing = {
+                model._meta.db_table: set(connection.introspection.get_constraints(cursor, model._meta.db_table))
+                for model in {model for model, _ in indexes}
+            }
+            if not dry_run:
+                for extension in backend.get_extensions():
+                    cursor.execute(f"CREATE EXTENSION IF NOT EXISTS {connection.ops.quote_name(extension)}")
+
+        # concurrent index builds can't run in a transaction
+        with connection.schema_editor(atomic=False) as schema_editor:
+            for model, index in indexes:
+                if index.name in existing[model._meta.db_table]:
+                    self.stdout.write(f"{index.name} on {model._meta.db_table} already exists.")
+                    continue
+                if dry_run:
+                    self.stdout.write(f"Would create {index.name} on {model._meta.db_table}.")
+                    continue
+                schema_editor.add_index(model, index, concurrently=True)
+                self.stdout.write(self.style.SUCCESS(f"Created {index.name} on {model._meta.db_table}."))
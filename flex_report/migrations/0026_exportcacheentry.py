@@ -0,0 +1,32 @@
+# Generated by Django 5.1.15 on 2026-10-18 15:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flex_report', '0025_exportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True, verbose_name='Key')),
+                ('export_format', models.CharField(max_length=50, verbose_name='Export Format')),
+                ('file', models.FileField(upload_to='flex_report/cache/', verbose_name='File')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='Size')),
+                ('hits', models.PositiveIntegerField(default=0, verbose_name='Hits')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('last_accessed', models.DateTimeField(db_index=True, verbose_name='Last Accessed')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_cache_entries', to='flex_report.template', verbose_name='Template')),
+            ],
+            options={
+                'verbose_name': 'Export Cache Entry',
+                'verbose_name_plural': 'Export Cache Entries',
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.15 on 2026-10-18 15:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('flex_report', '0026_exportcacheentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportSearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.CharField(max_length=255, verbose_name='Object ID')),
+                ('text', models.TextField(blank=True, verbose_name='Text')),
+                ('modified_date', models.DateTimeField(auto_now=True, verbose_name='Modified Date')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='flex_search_documents', to='contenttypes.contenttype', verbose_name='Model')),
+            ],
+            options={
+                'verbose_name': 'Report Search Document',
+                'verbose_name_plural': 'Report Search Documents',
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'object_id'), name='unique_report_search_document')],
+            },
+        ),
+    ]
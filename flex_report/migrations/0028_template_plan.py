@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 15:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flex_report', '0027_reportsearchdocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='template',
+            name='plan',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='Plan'),
+        ),
+    ]
@@ -4,21 +4,28 @@ import mimetypes
 from logging import getLogger
 
 from django.core.exceptions import PermissionDenied
-from django.core.paginator import EmptyPage, Paginator
-from django.http import HttpResponseBadRequest, HttpResponseForbidden
-from django.shortcuts import HttpResponse
+from django.core.paginator import EmptyPage
+from django.db.models import Q, QuerySet
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, StreamingHttpResponse
+from django.shortcuts import HttpResponse, render
+from django.utils.cache import patch_vary_headers
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import View
 
 from flex_report import BaseExportFormat, export_format
 
 from .app_settings import app_settings
+from .compression import compressions, get_accepted_encodings
 from .filterset import (
+    compile_stored_filters,
     generate_filterset_from_model,
     generate_quicksearch_filterset_from_model,
 )
 from .forms import SavedFilterSelectForm
 from .models import Template
+from .paginators import InvalidCursor, KeysetPaginator, get_paginator
+from .plan import get_template_plan
+from .query import compile_report_qs
 from .utils import (
     FieldTypes,
     generate_filterset_form,
@@ -36,19 +43,46 @@ class PaginationMixin(View):
     pages = [25, 75, 100, 200]
     default_page = pages[0]
     pagination = None
+    pagination_mode = None
     page_keyword = "page"
     per_page_ketyword = "per_page"
+    count_keyword = "count"
+    count_template_name = "flex_report/pagination_count.html"
 
-    def get_page(self):
-        page = self.request.GET.get(self.page_keyword, 1)
-        per_page = (
+    def get_pagination_mode(self):
+        return self.pagination_mode or app_settings.PAGINATION_MODE
+
+    def get_count_url(self):
+        query = self.request.GET.copy()
+        query[self.count_keyword] = 1
+        return f"{self.request.path}?{query.urlencode()}"
+
+    def get(self, request, *args, **kwargs):
+        # the exact total of count-free pages is requested separately, once the page has rendered
+        if self.count_keyword in request.GET:
+            return render(request, self.count_template_name, {"count": self.get_paginate_qs().count()})
+        return super().get(request, *args, **kwargs)
+
+    def get_per_page(self):
+        return (
             p
             if (p := self.request.GET.get(self.per_page_ketyword, self.default_page)) and p in map(str, self.pages)
             else self.default_page
         )
 
+    def get_paginator(self, per_page):
+        return get_paginator(self.get_paginate_qs(), per_page, self.get_pagination_mode())
+
+    def get_page(self):
+        page = self.request.GET.get(self.page_keyword, 1)
+        paginator = self.get_paginator(self.get_per_page())
+
+        if isinstance(paginator, KeysetPaginator):
+            with contextlib.suppress(InvalidCursor):
+                return paginator.page(self.request.GET.get(self.page_keyword) or None)
+            return paginator.page()
+
         with contextlib.suppress(EmptyPage):
-            paginator = Paginator(self.get_paginate_qs(), per_page)
             return paginator.page(page)
 
         return paginator.page(1)
@@ -62,6 +96,11 @@ class PaginationMixin(View):
             "paginator": page.paginator,
             "page_keyword": self.page_keyword,
             "per_page_keyword": self.per_page_ketyword,
+            "mode": page.paginator.mode,
+            "next_page": page.next_page_number() if page.has_next() else None,
+            "previous_page": page.previous_page_number() if page.has_previous() else None,
+            "count_url": self.get_count_url() if page.paginator.mode == "deferred_count" else None,
+            "count_is_estimated": getattr(page.paginator, "count_is_estimated", False),
         }
         return context
 
@@ -112,6 +151,7 @@ class QuerySetExportMixin(View):
     export_columns = []
     export_kwargs = {}
     export_filename = None
+    compression_keyword = "compression"
 
     def get_export_filename(self):
         return self.export_filename
@@ -143,7 +183,7 @@ class QuerySetExportMixin(View):
         if exporter.check_auth():
             return
 
-        raise HttpResponseForbidden(content="403 Forbidden")
+        raise PermissionDenied("403 Forbidden")
 
     def dispatch(self, *args, **kwargs):
         if not (format_ := self.request.GET.get("format", "").lower()) or format_ not in export_format.formats.keys():
@@ -157,35 +197,92 @@ class QuerySetExportMixin(View):
     def get_exporter(self) -> BaseExportFormat:
         try:
             format_ = export_format.formats[self.export_format]
-            if any(self.get_handle_qs().values()):
-                return type("DynamicExporter", (format_,), self.get_handle_qs())(
+            handle_qs = self.get_handle_qs()
+            # querysets are checked with `is not None` so that they aren't evaluated here
+            if any(v is not None if isinstance(v, QuerySet) else v for v in handle_qs.values()):
+                return type("DynamicExporter", (format_,), handle_qs)(
                     request=self.request, user=self.request.user
                 )
             return format_(request=self.request, user=self.request.user)
         except KeyError as e:
             raise NotImplementedError(f"The wanted format '{self.export_format}' isn't handled.") from e
 
-    def get(self, *args, **kwargs):
-        format_ = self.get_exporter()
-        filename = str(format_.get_export_filename())
+    def get_content_type(self, exporter):
+        return mimetypes.types_map.get(
+            f".{exporter.format_ext.lstrip('.')}",
+            "application/octet-stream",
+        )
+
+    def get_export_compression(self, exporter):
+        """
+        Returns the compression of the export and whether it's applied as the response's `Content-Encoding`.
+        A compression requested with the `compression` query parameter produces a compressed file,
+        while one negotiated through `Accept-Encoding` is undone by the client on download.
+        Only streaming formats marked as `compressible` are compressed.
+        """
+        if not (exporter.streaming and exporter.compressible):
+            return None, False
+
+        if name := self.request.GET.get(self.compression_keyword, "").lower():
+            return compressions.get(name), False
+
+        if app_settings.EXPORT_CONTENT_ENCODING:
+            accepted = get_accepted_encodings(self.request.headers.get("Accept-Encoding", ""))
+            for name, compression in compressions.items():
+                if name in accepted:
+                    return compression, True
+
+        return None, False
+
+    def compress_export_response(self, response, exporter):
+        compression, content_encoding = self.get_export_compression(exporter)
+        if not (compression and response.streaming):
+            return response
+
+        response.streaming_content = compression.compress(response.streaming_content)
+        if response.has_header("Content-Length"):
+            del response["Content-Length"]
+
+        if content_encoding:
+            response["Content-Encoding"] = compression.name
+            patch_vary_headers(response, ["Accept-Encoding"])
+            return response
+
+        filename = f"{exporter.get_export_filename()}{compression.ext}"
+        response["Content-Type"] = compression.content_type
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def get_export_response(self, exporter):
+        filename = str(exporter.get_export_filename())
+        headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+        if exporter.streaming:
+            return StreamingHttpResponse(
+                exporter.iter_chunks(),
+                content_type=self.get_content_type(exporter),
+                headers=headers,
+            )
 
         response = HttpResponse(
-            content_type=mimetypes.types_map.get(
-                f".{format_.format_ext}",
-                "application/octet-stream",
-            ),
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            content_type=self.get_content_type(exporter),
+            headers=headers,
         )
-        response = format_.handle_response(
+        response = exporter.handle_response(
             response=response,
         )
 
         return response
 
+    def get(self, *args, **kwargs):
+        exporter = self.get_exporter()
+        return self.compress_export_response(self.get_export_response(exporter), exporter)
+
 
 class TablePageMixin(PaginationMixin, TemplateObjectMixin):
     page_keyword = "report_page"
     per_page_keyword = "report_per_page"
+    count_keyword = "report_count"
     page_template_keyword = "report_template"
     saved_filter_keyword = "saved_filter"
 
@@ -194,6 +291,7 @@ class TablePageMixin(PaginationMixin, TemplateObjectMixin):
 
     template_columns = None
     template_searchable_fields = None
+    template_plan = None
     report_qs = None
     filters = None
     quicksearch = None
@@ -201,6 +299,16 @@ class TablePageMixin(PaginationMixin, TemplateObjectMixin):
     ignore_search_values = ["unknown"]
     ignore_search_keys = ["report_template"]
 
+    def memoize(self, key, func):
+        """
+        Returns the result of `func`, computing it once per view instance, which lives for a single request.
+        Used for what's needed by several steps of a request, like the report queryset and its filtersets.
+        """
+        memo = self.__dict__.setdefault("_request_memo", {})
+        if key not in memo:
+            memo[key] = func()
+        return memo[key]
+
     def get_template(self):
         templates = self.get_page_templates()
         default_template = templates.filter(is_page_default=True).first() or templates.first()
@@ -212,14 +320,18 @@ class TablePageMixin(PaginationMixin, TemplateObjectMixin):
 
         return default_template
 
-    def setup_filters(self):
+    def get_stored_filters(self):
+        """Returns the filter data of the template, with the selected saved filter's applied over it."""
         saved_filters = getattr(self.get_saved_filter(), "filters", {})
+        return (self.template_object.filters | saved_filters) or {}
+
+    def setup_filters(self):
         initials = self.get_initials()
         initials.pop(self.saved_filter_keyword, None)
         form_classes = self.get_form_classes()
 
         self.template_filters = generate_filterset_from_model(self.report_model, form_classes)(
-            (self.template_object.filters | saved_filters) or {}
+            self.get_stored_filters()
         )
         self.filters = generate_filterset_from_model(self.report_model, form_classes)(initials)
         self.quicksearch = generate_quicksearch_filterset_from_model(
@@ -231,7 +343,8 @@ class TablePageMixin(PaginationMixin, TemplateObjectMixin):
         LOGICAL_OPERATORS = ["(", ")", "&", "|", "!="]
         return any(op in filter_path for op in LOGICAL_OPERATORS)
 
-    def apply_user_path(self, report_qs):
+    def get_user_path_scope(self):
+        """Returns the `(filter_path, filter_value)` the rows are restricted to for the current user, if any."""
         access_handler = getattr(self.report_model, app_settings.MODEL_USER_PATH_FUNC_NAME, lambda request: {})
         accessed_paths = {
             name: {path: access_handler(self.request).get(name)}
@@ -241,12 +354,32 @@ class TablePageMixin(PaginationMixin, TemplateObjectMixin):
 
         matches_paths = next(iter(accessed_paths.keys()), "__all__")
         if not (accessed_paths and matches_paths):
+            return None
+
+        return next(iter(accessed_paths[matches_paths].items()))
+
+    def get_user_path_q(self):
+        if not (scope := self.get_user_path_scope()):
+            return Q()
+
+        filter_path, filter_value = scope
+        if self._has_logical_operator(filter_path):
+            return string_to_q(filter_path, filter_value)
+        return Q(**{filter_path: filter_value})
+
+    def apply_user_path(self, report_qs):
+        if not self.get_user_path_scope():
             return report_qs
 
-        filter_path, filter_value = next(iter(accessed_paths[matches_paths].items()))
-        filter_func = self._has_logical_operator(filter_path) and string_to_q or report_qs.filter
+        return report_qs.filter(self.get_user_path_q()).distinct()
 
-        return filter_func(**{filter_path: filter_value}).distinct()
+    def apply_related_lookups(self, report_qs):
+        select_related, prefetch_related = self.template_plan["select_related"], self.template_plan["prefetch_related"]
+        if select_related:
+            report_qs = report_qs.select_related(*select_related)
+        if prefetch_related:
+            report_qs = report_qs.prefetch_related(*prefetch_related)
+        return report_qs
 
     def _format_used_filter(self, col_name, val):
         formats = {**{k: _("Yes") for k in ["true", "True", True]}, **{k: "خیر" for k in ["false", "False", False]}}
@@ -260,16 +393,19 @@ class TablePageMixin(PaginationMixin, TemplateObjectMixin):
         )
 
     def validate_filters(self, *filters_list):
-        return any(f.get_filters() and f.data and f.is_valid() for f in filters_list)
+        return any(f.base_filters and f.data and f.is_valid() for f in filters_list)
 
     def get_saved_filter_form(self):
-        return SavedFilterSelectForm(
-            self.request.GET,
-            template=self.template_object,
+        return self.memoize(
+            "saved_filter_form",
+            lambda: SavedFilterSelectForm(
+                self.request.GET,
+                template=self.template_object,
+            ),
         )
 
     def get_saved_filter(self):
-        if not self.get_template():
+        if not self.template_object:
             return {}
 
         if not (saved_filter_form := self.get_saved_filter_form()).is_valid():
@@ -278,21 +414,35 @@ class TablePageMixin(PaginationMixin, TemplateObjectMixin):
         return getattr(saved_filter_form, "cleaned_data", {}).get(self.saved_filter_keyword) or {}
 
     def get_report_qs(self):
+        return self.memoize("report_qs", self.build_report_qs)
+
+    def build_report_qs(self):
         self.setup_filters()
 
-        report_qs = (
-            self.template_filters.qs.distinct()
-            if self.template_filters.get_filters()
-            else get_model_manager(self.report_model).all()
+        filtersets, conditions = [], []
+        has_stored_filters = False
+        if self.template_filters.base_filters:
+            # stored filters were validated when saved, so they're replayed from their compiled conditions
+            stored = compile_stored_filters(type(self.template_filters), self.template_filters.data)
+            if stored.conditions is None:
+                filtersets.append(self.template_filters)
+            else:
+                conditions.extend(stored.conditions)
+            has_stored_filters = bool(self.template_filters.data) and stored.is_valid
+
+        ordering = None
+        if has_request_filters := has_stored_filters or self.validate_filters(self.filters, self.quicksearch):
+            filtersets += [self.quicksearch, self.filters]
+            ordering = self.report_model._meta.ordering or ["pk"]
+
+        report_qs = compile_report_qs(
+            get_model_manager(self.report_model).all(),
+            filtersets=filtersets,
+            conditions=[*conditions, self.get_user_path_q()],
+            ordering=ordering,
         )
-        report_qs = self.apply_user_path(report_qs)
 
-        if self.validate_filters(self.filters, self.quicksearch, self.template_filters):
-            report_qs = (
-                report_qs.distinct()
-                .filter(pk__in=(self.quicksearch.qs.distinct() & self.filters.qs.distinct()).values("pk"))
-                .order_by(*self.report_model._meta.ordering or ["pk"])
-            )
+        if has_request_filters:
             cleaned_data = self.quicksearch.form.cleaned_data | self.filters.form.cleaned_data
             self.used_filters = self.get_used_filters(
                 {
@@ -302,7 +452,7 @@ class TablePageMixin(PaginationMixin, TemplateObjectMixin):
                 }
             )
 
-        return report_qs
+        return self.apply_related_lookups(report_qs)
 
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
@@ -312,8 +462,11 @@ class TablePageMixin(PaginationMixin, TemplateObjectMixin):
             return
 
         self.report_model = obj.model.model_class()
+        self.template_plan = get_template_plan(obj)
         self.template_columns = get_template_columns(obj, as_dict=False)
-        self.template_searchable_fields = get_template_columns(obj, searchables=True)
+        self.template_searchable_fields = {
+            col["id"]: col["title"] for col in self.template_plan["columns"] if col["searchable"]
+        }
         self.report_qs = self.get_report_qs()
 
     def get_used_filters(self, cleaned_data):
@@ -338,11 +491,17 @@ class TablePageMixin(PaginationMixin, TemplateObjectMixin):
         )
 
     def get_initials(self):
-        return {
-            k: self.get_initial_value(v, key=k)
-            for k, v in self.request.GET.dict().items()
-            if v.strip() and v not in self.ignore_search_values and k not in self.ignore_search_keys
-        }
+        # callers pop keys off the initials, so each gets its own copy
+        return dict(
+            self.memoize(
+                "initials",
+                lambda: {
+                    k: self.get_initial_value(v, key=k)
+                    for k, v in self.request.GET.dict().items()
+                    if v.strip() and v not in self.ignore_search_values and k not in self.ignore_search_keys
+                },
+            )
+        )
 
     def get_form_classes(self):
         if not self.template_object:
@@ -387,6 +546,9 @@ class TablePageMixin(PaginationMixin, TemplateObjectMixin):
         return context
 
     def get_page_templates(self):
-        return Template.objects.filter(page__url_name=self.request.resolver_match.view_name).order_by(
-            "-is_page_default"
+        return self.memoize(
+            "page_templates",
+            lambda: Template.objects.filter(page__url_name=self.request.resolver_match.view_name).order_by(
+                "-is_page_default"
+            ),
         )
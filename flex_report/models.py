@@ -255,6 +255,7 @@ class Template(models.Model):
         choices=Status.choices,
         default=Status.pending,
     )
+    plan = models.JSONField(verbose_name=_("Plan"), null=True, blank=True, editable=False)
 
     @property
     def is_completed(self):
@@ -314,3 +315,112 @@ class TemplateSavedFilter(models.Model):
         verbose_name = _("Template Saved Filter")
         verbose_name_plural = _("Template Saved Filters")
         unique_together = [("title", "template")]
+
+
+class ExportJob(models.Model):
+    class Status(models.TextChoices):
+        pending = "p", _("Pending")
+        running = "r", _("Running")
+        complete = "c", _("Completed")
+        failed = "f", _("Failed")
+
+    template = models.ForeignKey(
+        Template,
+        on_delete=models.CASCADE,
+        related_name="export_jobs",
+        verbose_name=_("Template"),
+    )
+    creator = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="export_jobs",
+        null=True,
+        blank=True,
+    )
+    export_format = models.CharField(max_length=50, verbose_name=_("Export Format"))
+    query_params = models.JSONField(verbose_name=_("Query Parameters"), default=dict, blank=True)
+    status = models.CharField(
+        max_length=1,
+        verbose_name=_("Status"),
+        choices=Status.choices,
+        default=Status.pending,
+        db_index=True,
+    )
+    progress = models.PositiveSmallIntegerField(verbose_name=_("Progress"), default=0)
+    row_count = models.PositiveIntegerField(verbose_name=_("Row Count"), default=0)
+    total_rows = models.PositiveIntegerField(verbose_name=_("Total Rows"), null=True, blank=True)
+    file = models.FileField(
+        upload_to="flex_report/exports/",
+        verbose_name=_("File"),
+        blank=True,
+    )
+    error = models.TextField(verbose_name=_("Error"), blank=True)
+    created = DatetimeField(auto_now_add=True, verbose_name=_("Created"))
+    started = DatetimeField(verbose_name=_("Started"), null=True, blank=True)
+    finished = DatetimeField(verbose_name=_("Finished"), null=True, blank=True)
+
+    @property
+    def is_finished(self):
+        return self.status in [self.Status.complete, self.Status.failed]
+
+    @property
+    def duration(self):
+        if not (self.started and self.finished):
+            return None
+        return self.finished - self.started
+
+    def __str__(self):
+        return f"{self.template} ({self.export_format}): {self.get_status_display()}"
+
+    class Meta:
+        verbose_name = _("Export Job")
+        verbose_name_plural = _("Export Jobs")
+        ordering = ["-created"]
+
+
+class ExportCacheEntry(models.Model):
+    key = models.CharField(max_length=64, unique=True, verbose_name=_("Key"))
+    template = models.ForeignKey(
+        Template,
+        on_delete=models.CASCADE,
+        related_name="export_cache_entries",
+        verbose_name=_("Template"),
+    )
+    export_format = models.CharField(max_length=50, verbose_name=_("Export Format"))
+    file = models.FileField(upload_to="flex_report/cache/", verbose_name=_("File"))
+    size = models.PositiveBigIntegerField(verbose_name=_("Size"), default=0)
+    hits = models.PositiveIntegerField(verbose_name=_("Hits"), default=0)
+    created = DatetimeField(auto_now_add=True, verbose_name=_("Created"))
+    last_accessed = DatetimeField(verbose_name=_("Last Accessed"), db_index=True)
+
+    def __str__(self):
+        return f"{self.template} ({self.export_format}): {self.key[:12]}"
+
+    class Meta:
+        verbose_name = _("Export Cache Entry")
+        verbose_name_plural = _("Export Cache Entries")
+
+
+class ReportSearchDocument(models.Model):
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name="flex_search_documents",
+        verbose_name=_("Model"),
+    )
+    object_id = models.CharField(max_length=255, verbose_name=_("Object ID"))
+    text = models.TextField(verbose_name=_("Text"), blank=True)
+    modified_date = DatetimeField(auto_now=True, verbose_name=_("Modified Date"))
+
+    def __str__(self):
+        return f"{self.content_type}: {self.object_id}"
+
+    class Meta:
+        verbose_name = _("Report Search Document")
+        verbose_name_plural = _("Report Search Documents")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id"],
+                name="unique_report_search_document",
+            ),
+        ]
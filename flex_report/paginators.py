@@ -0,0 +1,333 @@
+import base64
+import binascii
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import ModelIterable
+from django.utils.functional import cached_property
+from django_filters.utils import get_model_field
+
+from .app_settings import app_settings
+from .compiler import compile_accessor
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorEncoder(json.JSONEncoder):
+    """Encodes ordering values losslessly, as strings the model fields can parse back."""
+
+    def default(self, obj):
+        if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+            return obj.isoformat()
+        if isinstance(obj, (Decimal, uuid.UUID)):
+            return str(obj)
+        return super().default(obj)
+
+
+def is_nullable_path(model, path):
+    """Returns whether the field `path` leads to, or any relation on the way, can be null."""
+    parts = path.split(LOOKUP_SEP)
+    return any(
+        (field := get_model_field(model, LOOKUP_SEP.join(parts[: i + 1]))) is not None and field.null
+        for i in range(len(parts))
+    )
+
+
+def get_keyset_ordering(queryset):
+    """
+    Returns the ordering of `queryset` as `(field, descending)` pairs, ending with the primary key
+    so that every row has a distinct position, or None if the ordering can't be used for a keyset.
+    Nullable fields can't be used, as NULLs never compare as past the boundary of a page.
+    """
+    ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering) or []
+    keyset = []
+    for field in ordering:
+        if not isinstance(field, str) or field == "?":
+            return None
+        name = field.lstrip("-+")
+        # relations are ordered by their model's ordering, which can't be compared against a value
+        if (model_field := get_model_field(queryset.model, name)) is not None and model_field.is_relation:
+            return None
+        if is_nullable_path(queryset.model, name):
+            return None
+        keyset.append((name, field.startswith("-")))
+
+    pk_names = ["pk", queryset.model._meta.pk.name]
+    if not any(field in pk_names for field, _ in keyset):
+        keyset.append(("pk", False))
+    return keyset
+
+
+def encode_cursor(values, previous=False):
+    data = json.dumps({"v": values, "p": previous}, cls=CursorEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return list(data["v"]), bool(data["p"])
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+class KeysetPage:
+    """A page of a `KeysetPaginator`, which knows its neighbours through cursors instead of numbers."""
+
+    def __init__(self, object_list, paginator, *, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f"<KeysetPage of {len(self)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        return self.next_cursor
+
+    def previous_page_number(self):
+        return self.previous_cursor
+
+
+class KeysetPaginator:
+    """
+    Paginates a queryset by seeking past the last row of the previous page on the queryset's ordering,
+    instead of skipping rows with an OFFSET, so every page costs the same however deep it is.
+    Pages are addressed by opaque cursors holding the ordering values of their boundary rows.
+    """
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    @cached_property
+    def ordering(self):
+        return get_keyset_ordering(self.object_list)
+
+    def get_row_values(self, obj):
+        return [compile_accessor(field)(obj) for field, _ in self.ordering]
+
+    def get_seek_filter(self, values, previous):
+        """
+        Builds the filter of the rows after the boundary `values` in the ordering, or before them when `previous`.
+        For an ordering of `a, b` that's `a > x OR (a = x AND b > y)`, with the comparisons flipped for descending fields.
+        """
+        conditions = []
+        for i, (field, descending) in enumerate(self.ordering):
+            lookup = "lt" if descending != previous else "gt"
+            equals = {name: value for (name, _), value in zip(self.ordering[:i], values)}
+            conditions.append(Q(**equals, **{f"{field}__{lookup}": values[i]}))
+        return reduce(or_, conditions)
+
+    def page(self, cursor=None):
+        values, previous = decode_cursor(cursor) if cursor else (None, False)
+        if values is not None and len(values) != len(self.ordering):
+            raise InvalidCursor(cursor)
+
+        queryset = self.object_list.order_by(
+            *[f"-{field}" if descending != previous else field for field, descending in self.ordering]
+        )
+        if values is not None:
+            # decoded values that their fields can't parse are as invalid as a malformed cursor
+            try:
+                queryset = queryset.filter(self.get_seek_filter(values, previous))
+            except (ValueError, TypeError, ValidationError) as e:
+                raise InvalidCursor(cursor) from e
+
+        rows = list(queryset[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if previous:
+            rows.reverse()
+
+        if not rows:
+            return KeysetPage(rows, self)
+
+        first, last = self.get_row_values(rows[0]), self.get_row_values(rows[-1])
+        return KeysetPage(
+            rows,
+            self,
+            next_cursor=encode_cursor(last) if (has_more or previous) else None,
+            previous_cursor=encode_cursor(first, previous=True) if (values is not None and (has_more or not previous)) else None,
+        )
+
+
+class CountlessPage(Page):
+    def __init__(self, object_list, number, paginator, *, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def start_index(self):
+        # the inherited index counts the rows to tell an empty paginator apart
+        return (self.number - 1) * self.paginator.per_page + 1 if len(self) else 0
+
+    def end_index(self):
+        return self.start_index() + len(self) - 1 if len(self) else 0
+
+
+class CountlessPaginator(Paginator):
+    """
+    Numbered pagination that never counts the rows. A page fetches one row more than it shows
+    to know whether a next page exists, so the total and the number of pages are unknown.
+    """
+
+    def validate_number(self, number):
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError) as e:
+            raise PageNotAnInteger(self.error_messages["invalid_page"]) from e
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+
+        return CountlessPage(
+            rows[: self.per_page],
+            number,
+            self,
+            has_next=len(rows) > self.per_page,
+        )
+
+
+def estimate_count(queryset):
+    """
+    Returns the planner's row estimate for `queryset`, read from `EXPLAIN (FORMAT JSON)` of its SQL,
+    or None when the database isn't PostgreSQL or the query can't be explained.
+    """
+    if not isinstance(queryset, QuerySet):
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Numbered pagination whose total is the query planner's estimate on PostgreSQL,
+    falling back to an exact count when the estimate is below `PAGINATION_COUNT_ESTIMATE_THRESHOLD`
+    or on other databases. `count_is_estimated` tells whether the total is approximate.
+    """
+
+    @cached_property
+    def _count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < app_settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD:
+            return Paginator.count.func(self), False
+        return estimate, True
+
+    @property
+    def count(self):
+        return self._count[0]
+
+    @property
+    def count_is_estimated(self):
+        return self._count[1]
+
+
+class DeferredJoinPaginator(Paginator):
+    """
+    Numbered pagination that first selects only the primary keys of a page, which the database can
+    often read from an index alone, then loads the full rows and their relations for just those keys.
+    Deep pages skip their OFFSET over the key column instead of over whole joined rows.
+    """
+
+    def get_page_rows(self, bottom, top):
+        pks = list(self.object_list.values_list("pk", flat=True)[bottom:top])
+        if not pks:
+            return []
+
+        rows = {obj.pk: obj for obj in self.object_list.order_by().filter(pk__in=pks)}
+        return [rows[pk] for pk in pks if pk in rows]
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        return self._get_page(self.get_page_rows(bottom, top), number, self)
+
+
+PAGINATORS = {
+    "offset": Paginator,
+    "keyset": KeysetPaginator,
+    "countless": CountlessPaginator,
+    # the total is loaded afterwards through the count endpoint of the page
+    "deferred_count": CountlessPaginator,
+    "estimated": EstimatedCountPaginator,
+    "deferred_join": DeferredJoinPaginator,
+}
+
+
+def get_paginator(queryset, per_page, mode=None):
+    """
+    Returns the paginator of the given mode for `queryset`, with the mode it ended up using as its `mode`.
+    Keyset pagination falls back to numbered pages for querysets whose ordering it can't seek on,
+    and deferred joins to plain offsets for anything but querysets of model instances.
+    """
+    if mode not in PAGINATORS:
+        mode = "offset"
+    if mode == "keyset" and not (isinstance(queryset, QuerySet) and get_keyset_ordering(queryset) is not None):
+        mode = "offset"
+    if mode == "deferred_join" and not (
+        isinstance(queryset, QuerySet) and issubclass(queryset._iterable_class, ModelIterable)
+    ):
+        mode = "offset"
+
+    paginator = PAGINATORS[mode](queryset, per_page)
+    paginator.mode = mode
+    return paginator
@@ -0,0 +1,72 @@
+from django.utils.translation import get_language
+
+from .compiler import get_related_lookups
+from .constants import FieldTypes
+from .templatetags.flex_report_filters import get_column_verbose_name
+from .utils import get_column_type
+
+PLAN_VERSION = 1
+
+
+def get_template_related_paths(template, columns):
+    """Returns the attribute paths evaluated for every row of the template: columns and button fields."""
+    paths = [col.title for col in columns if col.column_type != FieldTypes.dynamic]
+    for button in template.buttons.all():
+        paths.extend(button.exposed_fields)
+        paths.extend(button.url_kwargs.values())
+        paths.extend(button.query_strings.values())
+    return paths
+
+
+def build_template_plan(template):
+    """
+    Resolves what rendering and exporting the template needs from its model, columns and buttons
+    into a JSON-serializable plan. Header labels are resolved in the active language, which the plan records.
+    """
+    model = template.model.model_class()
+    columns = list(template.columns.all())
+    select_related, prefetch_related = get_related_lookups(model, get_template_related_paths(template, columns))
+
+    column_plans = []
+    for col in columns:
+        column_type = get_column_type(model, col.title)
+        column_plans.append(
+            {
+                "id": col.pk,
+                "title": col.title,
+                "type": column_type,
+                "searchable": col.searchable,
+                "header": None if column_type == FieldTypes.dynamic else str(get_column_verbose_name(model, col.title)),
+            }
+        )
+
+    return {
+        "version": PLAN_VERSION,
+        "language": get_language(),
+        "columns": column_plans,
+        "select_related": sorted(select_related),
+        "prefetch_related": sorted(prefetch_related),
+    }
+
+
+def rebuild_template_plan(template):
+    from .models import Template
+
+    template.plan = build_template_plan(template)
+    # saved with an update so that neither signals nor the modified date are triggered
+    Template.objects.filter(pk=template.pk).update(plan=template.plan)
+    return template.plan
+
+
+def get_template_plan(template):
+    """Returns the plan of the template, building it first if it's missing or out of date."""
+    if not template.plan or template.plan.get("version") != PLAN_VERSION:
+        return rebuild_template_plan(template)
+    return template.plan
+
+
+def get_plan_headers(plan):
+    """Returns the header labels of the plan's columns by title, or None if they're in another language."""
+    if plan["language"] != get_language():
+        return None
+    return {col["title"]: col["header"] for col in plan["columns"]}
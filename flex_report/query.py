@@ -0,0 +1,35 @@
+from django.db.models import Exists, OuterRef
+from django.db.models.fields.related import ForeignObjectRel
+
+
+def has_multivalued_joins(queryset):
+    """Returns whether `queryset` joins a to-many relation, which can repeat its rows."""
+    return any(
+        isinstance(join_field := getattr(join, "join_field", None), ForeignObjectRel) and join_field.multiple
+        for join in queryset.query.alias_map.values()
+    )
+
+
+def compile_report_qs(queryset, *, filtersets=(), conditions=(), ordering=None):
+    """
+    Applies the filters of `filtersets` and the `conditions` Q objects to `queryset` in a single query.
+    Each filterset filters on its own joins, as if it was applied on its own.
+    Filters that don't join a to-many relation are combined into one WHERE clause without a DISTINCT.
+    Otherwise the filtered query becomes an EXISTS of `queryset`, which doesn't repeat rows either.
+    """
+    filtered = queryset
+    for filterset in filtersets:
+        # validates the form, so that its cleaned data can be filtered on
+        filterset.is_valid()
+        filtered = filterset.filter_queryset(filtered)
+    for condition in conditions:
+        filtered = filtered.filter(condition)
+
+    if filtered.query.distinct and not filtered.query.distinct_fields:
+        # filters may ask for a DISTINCT in case they join to-many relations, which the EXISTS takes care of
+        filtered = filtered.all()
+        filtered.query.distinct = False
+    if has_multivalued_joins(filtered):
+        filtered = queryset.filter(Exists(filtered.order_by().filter(pk=OuterRef("pk"))))
+
+    return filtered.order_by(*ordering) if ordering else filtered
@@ -0,0 +1,79 @@
+from functools import lru_cache
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .app_settings import app_settings
+from .constants import REPORT_CELL_STYLE_MAP
+
+
+class TypeRegistry:
+    """
+    Maps types to entries, resolving a type to the entry of the nearest class in its MRO,
+    or to `default` when none of them is registered.
+    Resolutions are memoized per type, so looking up a type again is a single dict access.
+    """
+
+    def __init__(self, entries=None, default=None):
+        self.entries = dict(entries or {})
+        self.default = default
+        self._resolved = {}
+
+    def register(self, type_, entry):
+        self.entries[type_] = entry
+        self._resolved.clear()
+
+    def get(self, type_):
+        try:
+            return self._resolved[type_]
+        except KeyError:
+            pass
+
+        entry = next(
+            (self.entries[klass] for klass in type_.__mro__ if klass in self.entries),
+            self.default,
+        )
+        self._resolved[type_] = entry
+        return entry
+
+    def get_for_value(self, value):
+        return self.get(type(value))
+
+
+@lru_cache(maxsize=None)
+def get_time_formats():
+    """Resolves a field class to its time format from `TIME_FORMATS`."""
+    return TypeRegistry(app_settings.TIME_FORMATS)
+
+
+@lru_cache(maxsize=None)
+def get_data_tags():
+    """Resolves a field class to the HTML tag function from `DATA_TAGS` its cells are rendered with."""
+    data_tags = app_settings.DATA_TAGS
+    return TypeRegistry(
+        {k: v for k, v in data_tags.items() if k != "default"},
+        default=data_tags["default"],
+    )
+
+
+@lru_cache(maxsize=None)
+def get_cell_styles():
+    """Resolves a value type to its spreadsheet cell style from `REPORT_CELL_STYLE_MAP`."""
+    return TypeRegistry(REPORT_CELL_STYLE_MAP)
+
+
+def clear_registries():
+    from .compiler import compile_column
+    from .filterset import clear_filterset_cache
+
+    get_time_formats.cache_clear()
+    get_data_tags.cache_clear()
+    get_cell_styles.cache_clear()
+    compile_column.cache_clear()
+    clear_filterset_cache()
+
+
+@receiver(setting_changed)
+def clear_registries_on_setting_changed(setting, **kwargs):
+    if setting.startswith(app_settings.prefix):
+        clear_registries()
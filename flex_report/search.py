@@ -0,0 +1,270 @@
+import contextlib
+import re
+from functools import reduce
+from operator import or_
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, models
+from django.db.backends.utils import names_digest
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Cast
+
+from .app_settings import app_settings
+from .compiler import compile_accessor
+
+postgres_indexes = postgres_lookups = postgres_search = None
+with contextlib.suppress(ImportError):
+    from django.contrib.postgres import indexes as postgres_indexes
+    from django.contrib.postgres import lookups as postgres_lookups
+    from django.contrib.postgres import search as postgres_search
+
+SEARCH_TERM_RE = re.compile(r"\w+")
+# the unit separator, which normalizing turns into a space like any whitespace
+SEARCH_DOCUMENT_SEPARATOR = "\x1f"
+# arabic letters commonly typed in place of their persian forms, and the zero-width non-joiner
+SEARCH_TEXT_TRANSLATION = str.maketrans({"ي": "ی", "ى": "ی", "ك": "ک", "\u200c": " "})
+
+
+def resolve_search_field(model, path):
+    """
+    Follows a searchable column path like `customer__name` to the `(model, field)` it ends on,
+    or returns None when the path isn't made of concrete fields.
+    """
+    field = None
+    for name in path.split(LOOKUP_SEP):
+        if field is not None:
+            if not field.is_relation:
+                return None
+            model = field.related_model
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+    if field is None or not field.concrete:
+        return None
+    return model, field
+
+
+def is_text_field(model, path):
+    return (resolved := resolve_search_field(model, path)) is not None and isinstance(
+        resolved[1], (models.CharField, models.TextField)
+    )
+
+
+class BaseQuicksearchBackend:
+    """Filters a report queryset by the quick search `value` over the searchable fields of the report."""
+
+    def search(self, queryset, fields, value):
+        raise NotImplementedError
+
+    def get_extensions(self):
+        """Returns the database extensions the indexes of the backend depend on."""
+        return []
+
+    def get_index(self, model, field):
+        """Returns the index that makes searching `field` of `model` fast, or None if it has none."""
+        return None
+
+    def get_indexes(self, search_fields):
+        """Returns the `(model, index)` pairs that make searching the `(model, field)` pairs of `search_fields` fast."""
+        return [(model, index) for model, field in search_fields if (index := self.get_index(model, field)) is not None]
+
+
+class IContainsQuicksearchBackend(BaseQuicksearchBackend):
+    """Matches rows whose searchable fields contain the value, on any database."""
+
+    def search(self, queryset, fields, value):
+        q_object = reduce(or_, [Q(**{f"{field}__icontains": value}) for field in fields], Q())
+        return queryset.filter(q_object) if q_object else queryset.none()
+
+
+class PostgresQuicksearchBackend(BaseQuicksearchBackend):
+    """A backend using PostgreSQL's search features, which falls back to `icontains` on other databases."""
+
+    index_suffix = None
+
+    def search(self, queryset, fields, value):
+        if postgres_search is None or connections[queryset.db].vendor != "postgresql":
+            return IContainsQuicksearchBackend().search(queryset, fields, value)
+        if not fields:
+            return queryset.none()
+        return self.search_postgres(queryset, fields, value)
+
+    def search_postgres(self, queryset, fields, value):
+        raise NotImplementedError
+
+    def get_index_name(self, model, field):
+        return f"flex_{self.index_suffix}_{names_digest(model._meta.db_table, field.column, length=12)}"
+
+
+class FullTextQuicksearchBackend(PostgresQuicksearchBackend):
+    """
+    Matches rows having words of any searchable field that start with every word of the value,
+    with `to_tsvector` of each field compared against a prefix `tsquery`.
+    """
+
+    config = "simple"
+    index_suffix = "fts"
+
+    def get_vector(self, field):
+        return postgres_search.SearchVector(field, config=self.config)
+
+    def get_query(self, value):
+        terms = SEARCH_TERM_RE.findall(value)
+        if not terms:
+            return None
+        return postgres_search.SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            config=self.config,
+            search_type="raw",
+        )
+
+    def search_postgres(self, queryset, fields, value):
+        if (query := self.get_query(value)) is None:
+            return queryset.none()
+        return queryset.filter(
+            reduce(or_, [Q(postgres_search.SearchVectorExact(self.get_vector(field), query)) for field in fields])
+        )
+
+    def get_index(self, model, field):
+        return postgres_indexes.GinIndex(self.get_vector(field.name), name=self.get_index_name(model, field))
+
+
+class TrigramQuicksearchBackend(PostgresQuicksearchBackend):
+    """
+    Matches rows having a searchable field with a word similar to the value, using `pg_trgm`,
+    which tolerates typos and partial words.
+    """
+
+    index_suffix = "trgm"
+
+    def get_extensions(self):
+        return ["pg_trgm"]
+
+    def search_postgres(self, queryset, fields, value):
+        model = queryset.model
+        return queryset.filter(
+            reduce(
+                or_,
+                [
+                    Q(
+                        postgres_lookups.TrigramWordSimilar(
+                            F(field) if is_text_field(model, field) else Cast(field, models.TextField()),
+                            value,
+                        )
+                    )
+                    for field in fields
+                ],
+            )
+        )
+
+    def get_index(self, model, field):
+        if not isinstance(field, (models.CharField, models.TextField)):
+            return None
+        return postgres_indexes.GinIndex(
+            fields=[field.name],
+            opclasses=["gin_trgm_ops"],
+            name=self.get_index_name(model, field),
+        )
+
+
+class SearchDocumentQuicksearchBackend(BaseQuicksearchBackend):
+    """
+    Matches rows whose search document contains the value, on any database.
+    Documents are built from every searchable column of the model, including relations and properties,
+    so a search is a single lookup on one table instead of a join per searchable relation.
+    Searches over other fields, like those of a template leaving some searchable columns out, fall back to `icontains`.
+    On PostgreSQL, the `flex_report_search_indexes` command creates a trigram index serving the lookup.
+    """
+
+    index_name = "flex_search_document_trgm"
+
+    def search(self, queryset, fields, value):
+        from .models import ReportSearchDocument
+
+        model = queryset.model
+        if set(fields) != set(get_search_document_paths(model)):
+            return IContainsQuicksearchBackend().search(queryset, fields, value)
+
+        pk = model._meta.pk.target_field if model._meta.pk.is_relation else model._meta.pk
+        documents = ReportSearchDocument.objects.filter(
+            content_type=ContentType.objects.get_for_model(model),
+            text__contains=normalize_search_text(value),
+        )
+        return queryset.filter(pk__in=documents.values(object_pk=Cast("object_id", pk)))
+
+    def get_extensions(self):
+        return ["pg_trgm"]
+
+    def get_indexes(self, search_fields):
+        from .models import ReportSearchDocument
+
+        return [
+            (
+                ReportSearchDocument,
+                postgres_indexes.GinIndex(fields=["text"], opclasses=["gin_trgm_ops"], name=self.index_name),
+            )
+        ]
+
+
+def get_quicksearch_backend():
+    return app_settings.QUICKSEARCH_BACKEND()
+
+
+def search_documents_enabled():
+    return issubclass(app_settings.QUICKSEARCH_BACKEND, SearchDocumentQuicksearchBackend)
+
+
+def normalize_search_text(text):
+    return " ".join(str(text).translate(SEARCH_TEXT_TRANSLATION).casefold().split())
+
+
+def get_search_document_paths(model):
+    """
+    Returns the paths of the searchable columns of `model`, which its search documents are built from.
+    They're read from the database every time, so that every process builds documents from the same paths.
+    """
+    from .models import Column
+
+    columns = Column.objects.filter(
+        model=ContentType.objects.get_for_model(model),
+        searchable=True,
+        column_type=Column.COLUMN_TYPES.model,
+    ).order_by("pk")
+    return tuple(dict.fromkeys(columns.values_list("title", flat=True)))
+
+
+def build_search_document_text(obj, paths):
+    """
+    Returns the search document of `obj`, with the values of `paths` joined by a separator
+    that normalized search values can't hold, so that a search never matches across two values.
+    """
+    parts = []
+    for path in paths:
+        value = compile_accessor(path)(obj)
+        if isinstance(value, models.Manager):
+            parts.extend(map(str, value.all()))
+        elif value is not None:
+            parts.append(str(value))
+    return SEARCH_DOCUMENT_SEPARATOR.join(filter(None, map(normalize_search_text, parts)))
+
+
+def update_search_document(obj):
+    from .models import ReportSearchDocument
+
+    ReportSearchDocument.objects.update_or_create(
+        content_type=ContentType.objects.get_for_model(type(obj)),
+        object_id=str(obj.pk),
+        defaults={"text": build_search_document_text(obj, get_search_document_paths(type(obj)))},
+    )
+
+
+def delete_search_document(obj):
+    from .models import ReportSearchDocument
+
+    ReportSearchDocument.objects.filter(
+        content_type=ContentType.objects.get_for_model(type(obj)),
+        object_id=str(obj.pk),
+    ).delete()
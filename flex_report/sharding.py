@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import Max, Min
+
+from .jobs import build_export_view
+from .models import Template
+
+
+def get_pk_ranges(queryset, shards):
+    """
+    Splits `queryset` into at most `shards` contiguous, inclusive primary key ranges of equal width.
+    Gaps in the keys make the ranges uneven, which is why more shards than workers should be used.
+    Querysets with non-integer primary keys aren't split.
+    """
+    bounds = queryset.order_by().aggregate(low=Min("pk"), high=Max("pk"))
+    low, high = bounds["low"], bounds["high"]
+    if low is None:
+        return []
+    if not isinstance(low, int):
+        return [(low, high)]
+
+    width = max((high - low + 1) // shards, 1)
+    ranges = []
+    while low <= high:
+        ranges.append((low, min(low + width - 1, high)))
+        low += width
+    return ranges
+
+
+def _init_worker():
+    django.setup()
+    # connections inherited from the parent process must not be shared
+    connections.close_all()
+
+
+def export_shard(template_id, user_id, query_params, export_format, pk_range, directory, include_header):
+    """Exports the rows of the template whose primary keys fall in `pk_range` into a file and returns its path."""
+    template = Template.objects.get(pk=template_id)
+    user = get_user_model().objects.filter(pk=user_id).first() if user_id else None
+    view = build_export_view(template, user, query_params, export_format)
+
+    exporter = view.get_exporter()
+    exporter.export_qs = view.get_export_qs().filter(pk__range=pk_range).order_by("pk")
+    exporter.include_header = include_header
+
+    fd, path = tempfile.mkstemp(dir=directory)
+    with os.fdopen(fd, "wb") as output:
+        for chunk in exporter.iter_chunks():
+            output.write(chunk)
+    return path
+
+
+def run_sharded_export(
+    template,
+    output,
+    *,
+    user=None,
+    query_params=None,
+    export_format="csv",
+    workers=None,
+    shards=None,
+    on_shard_done=None,
+):
+    """
+    Exports a template by splitting its queryset into primary key ranges that are exported
+    by a pool of processes, each with its own database connection, and writes the shards to `output` in order.
+    Rows come out ordered by primary key, and only the first shard writes a header.
+    Only formats whose files can be concatenated, marked as `shardable`, are supported.
+    """
+    view = build_export_view(template, user, query_params, export_format)
+    if not view.get_exporter().shardable:
+        raise ValueError(f"The '{export_format}' format can't be exported in shards.")
+
+    workers = workers or os.cpu_count()
+    if not (pk_ranges := get_pk_ranges(view.get_export_qs(), shards or workers * 4)):
+        for chunk in view.get_exporter().iter_chunks():
+            output.write(chunk)
+        return output
+
+    # forked workers would otherwise share the parent's connections
+    connections.close_all()
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor,
+    ):
+        paths = executor.map(
+            export_shard,
+            *zip(
+                *[
+                    (
+                        template.pk,
+                        getattr(user, "pk", None),
+                        query_params,
+                        export_format,
+                        pk_range,
+                        directory,
+                        number == 0,
+                    )
+                    for number, pk_range in enumerate(pk_ranges)
+                ]
+            ),
+        )
+        for number, path in enumerate(paths, start=1):
+            with open(path, "rb") as shard:
+                shutil.copyfileobj(shard, output)
+            os.remove(path)
+            if on_shard_done:
+                on_shard_done(number, len(pk_ranges))
+
+    return output
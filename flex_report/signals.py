@@ -0,0 +1,73 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from flex_report import report_model
+
+from .filterset import clear_filterset_cache
+from .models import Column, TableButton, Template
+from .plan import rebuild_template_plan
+from .search import (
+    delete_search_document,
+    get_search_document_paths,
+    search_documents_enabled,
+    update_search_document,
+)
+
+
+@receiver(post_save, sender=Column)
+@receiver(post_delete, sender=Column)
+@receiver(post_save, sender=Template)
+@receiver(post_delete, sender=Template)
+def clear_filterset_cache_on_change(**kwargs):
+    # searchable columns are part of the cache keys, so entries of edited templates are stale
+    clear_filterset_cache()
+
+
+def is_search_document_model(model):
+    return model in report_model.models and search_documents_enabled() and get_search_document_paths(model)
+
+
+@receiver(post_save)
+def update_search_document_on_save(sender, instance, raw=False, **kwargs):
+    if not raw and is_search_document_model(sender):
+        update_search_document(instance)
+
+
+@receiver(post_delete)
+def delete_search_document_on_delete(sender, instance, **kwargs):
+    if is_search_document_model(sender):
+        delete_search_document(instance)
+
+
+@receiver(post_save, sender=Template)
+def rebuild_template_plan_on_save(instance, raw=False, **kwargs):
+    if not raw:
+        rebuild_template_plan(instance)
+
+
+@receiver(m2m_changed, sender=Template.columns.through)
+@receiver(m2m_changed, sender=Template.buttons.through)
+def rebuild_template_plan_on_m2m_changed(instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            rebuild_template_plan(instance)
+        return
+
+    # the plans of the templates are rebuilt the next time they're used
+    if action in ("post_add", "post_remove"):
+        Template.objects.filter(pk__in=pk_set).update(plan=None)
+    elif action == "pre_clear":
+        relation = "columns" if isinstance(instance, Column) else "buttons"
+        Template.objects.filter(**{relation: instance}).update(plan=None)
+
+
+@receiver(post_save, sender=Column)
+@receiver(pre_delete, sender=Column)
+def clear_column_template_plans(instance, **kwargs):
+    Template.objects.filter(columns=instance).update(plan=None)
+
+
+@receiver(post_save, sender=TableButton)
+@receiver(pre_delete, sender=TableButton)
+def clear_button_template_plans(instance, **kwargs):
+    Template.objects.filter(buttons=instance).update(plan=None)
@@ -15,10 +15,11 @@ from django.urls import reverse
 from django.urls.exceptions import NoReverseMatch
 from django.utils.safestring import mark_safe
 from flex_report.app_settings import app_settings
+from flex_report.compiler import compile_column
+from flex_report.registry import get_data_tags
 from flex_report.utils import (
     get_col_verbose_name,
     get_column_cell,
-    get_model_field,
 )
 
 register = template.Library()
@@ -37,14 +38,23 @@ def enum(iterable: Iterable):
     return enumerate(iterable)
 
 
-@register.inclusion_tag("flex_report/pagination.html", takes_context=True)
+@register.simple_tag(takes_context=True)
 def show_pagination(context, pagination_context=None, *, link_attributes=None, scroll_tag=None):
-    return {
-        "request": context["request"],
-        "link_attributes": link_attributes,
-        "scroll_tag": scroll_tag,
-        **(pagination_context or context["pagination"]),
-    }
+    pagination = pagination_context or context["pagination"]
+    # keyset pages have neither numbers nor a total, so they're linked to through their cursors
+    template_name = (
+        "flex_report/keyset_pagination.html" if pagination.get("mode") == "keyset" else "flex_report/pagination.html"
+    )
+    return context.template.engine.get_template(template_name).render(
+        context.new(
+            {
+                "request": context["request"],
+                "link_attributes": link_attributes,
+                "scroll_tag": scroll_tag,
+                **pagination,
+            }
+        )
+    )
 
 
 @register.filter(name="range")
@@ -131,13 +141,11 @@ def get_columns_verbose_names(cols: Iterable, obj):
 
 @register.filter
 def get_row_value(obj, column):
-    field = get_model_field(obj, column)
-    value = get_column_cell(obj, column, absolute_url=False)
+    compiled_column = compile_column(obj._meta.model, column, False)
+    field = compiled_column.field
+    value = compiled_column.cell(obj)
 
-    tag = app_settings.DATA_TAGS.get(
-        type(field),
-        app_settings.DATA_TAGS["default"],
-    )
+    tag = get_data_tags().get(type(field))
     return mark_safe(tag(value) if is_row_value_valid(field, value) else "&mdash;")
 
 
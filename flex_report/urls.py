@@ -9,6 +9,7 @@ app_name = "flex_report"
 template_urls = [
     path("", VIEWS["TEMPLATE_LIST"], name="index"),
     path("<int:pk>/export", VIEWS["REPORT_EXPORT"], name="export"),
+    path("<int:pk>/export/job/", VIEWS["EXPORT_JOB_CREATE"], name="export_job"),
     path(
         "new/",
         VIEWS["TEMPLATE_CREATE_INIT"],
@@ -64,10 +65,27 @@ column_urls = [
     ),
 ]
 
+export_job_urls = [
+    path(
+        route="<int:pk>/",
+        view=VIEWS["EXPORT_JOB_DETAIL"],
+        name="detail",
+    ),
+    path(
+        route="<int:pk>/download/",
+        view=VIEWS["EXPORT_JOB_DOWNLOAD"],
+        name="download",
+    ),
+]
+
 urlpatterns = [
     path("<int:pk>/", VIEWS["REPORT"], name="view"),
     path("export/", VIEWS["GENERAL_QS_EXPORT"], name="export"),
     path("columns/", include((column_urls, "column"), namespace="column")),
+    path(
+        "export-jobs/",
+        include((export_job_urls, "export_job"), namespace="export_job"),
+    ),
     path(
         "template/",
         include((template_urls, "template"), namespace="template"),
@@ -9,36 +9,41 @@ from collections import OrderedDict
 from decimal import Decimal
 from functools import lru_cache, reduce
 from importlib import import_module
-from itertools import chain
+from itertools import chain, islice
 from logging import getLogger
-from operator import and_, attrgetter, methodcaller, or_
+from operator import and_, or_
 from typing import List
 
 import jdatetime
 import pandas as pd
+import xlsxwriter
 import xlwt
 from django import apps, forms
 from django.contrib.contenttypes.models import ContentType
+from django.conf import settings
 from django.db import models
 from django.db.models import Model, Q, QuerySet
 from django.db.models.fields.related import ForeignObjectRel, RelatedField
+from django.db.models.query import ModelIterable
 from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from django.utils.functional import Promise
 from django.utils.safestring import mark_safe
 from django.utils.translation import override
 from django_filters import FilterSet
 from django_filters.constants import ALL_FIELDS
 from django_filters.utils import LOOKUP_SEP, get_all_model_fields, get_model_field
+from django_jalali.db import models as jmodels
 from djmoney.models import fields as money_fields
 from djmoney.money import Money
-from phonenumber_field.modelfields import PhoneNumberField
 from phonenumber_field.phonenumber import PhoneNumber
 
 from . import BaseExportFormat, ReportModel, dynamic_field, export_format
 from .fields import FieldFileAbsoluteURL
+from .registry import get_cell_styles
 
-from .app_settings import app_settings
+from .compiler import compile_columns, get_cell, get_related_lookups, get_value, get_values_paths
 from .constants import (
-    REPORT_CELL_STYLE_MAP,
     REPORT_CUSTOM_FIELDS_KEY,
     REPORT_EXCULDE_KEY,
     REPORT_FIELDS_KEY,
@@ -49,6 +54,13 @@ from .constants import (
 
 logger = getLogger(__name__)
 
+pa = pq = orjson = None
+with contextlib.suppress(ImportError):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+with contextlib.suppress(ImportError):
+    import orjson
+
 
 def transform_nulls(filters: dict) -> dict:
     return {k: v for k, v in filters.items() if v not in [None, "", [], {}]}
@@ -467,7 +479,8 @@ class ObjectEncoder(json.JSONEncoder):
         elif isinstance(obj, models.QuerySet):
             return list(obj)
         elif isinstance(
-            obj, (datetime.datetime, datetime.date, jdatetime.datetime, jdatetime.date)
+            obj,
+            (datetime.datetime, datetime.date, datetime.time, jdatetime.datetime, jdatetime.date),
         ):
             return obj.isoformat()
         elif isinstance(obj, Money):
@@ -476,6 +489,10 @@ class ObjectEncoder(json.JSONEncoder):
             return float(obj)
         elif isinstance(obj, PhoneNumber):
             return obj.as_national
+        elif isinstance(obj, FieldFileAbsoluteURL):
+            return obj.url or None
+        elif isinstance(obj, Promise):
+            return str(obj)
 
         return json.JSONEncoder.default(self, obj)
 
@@ -489,7 +506,7 @@ def clean_request_data(data, filterset):
     by using ObjectEncoders.
     """
     data_keys = set(data)
-    filters_name = data_keys & set(filterset.get_filters())
+    filters_name = data_keys & set(filterset.base_filters)
     filters = {name: data.get(name) for name in filters_name}
     other = {k for k in data_keys if not k.startswith("csrf")} - filters_name
     return json.loads(
@@ -499,8 +516,18 @@ def clean_request_data(data, filterset):
     )
 
 
+@lru_cache(maxsize=None)
+def _generate_default_filterset_form(model):
+    return type(f"{getattr(model, '__name__', '')}DynamicFilterSetForm", (forms.Form,), {})
+
+
 def generate_filterset_form(model, *, form_classes=None, fields=None):
-    """Generates a form class dynammically created for the given model."""
+    """
+    Generates a form class dynammically created for the given model.
+    The plain form of a model is created once, so that the filtersets keyed by it are reused.
+    """
+    if form_classes is None and fields is None:
+        return _generate_default_filterset_form(model)
     if form_classes is None:
         form_classes = [forms.Form]
     if fields is None:
@@ -535,46 +562,16 @@ def get_column_cell(obj, name, *, absolute_url=True):
     Takes in an object and a column name, and returns the value of the column for the object.
     If the column is a custom field, it returns the value of the custom field.
     """
-    model = obj._meta.model if hasattr(obj, "_meta") else None
-
-    if isinstance(name, DynamicSubField):
-        return name.get_value(obj)
-
-    if callable(name):
-        return name(obj, name)
+    return get_cell(obj, name, absolute_url=absolute_url)
 
-    if isinstance(obj, dict):
-        return obj.get(name, app_settings.DEFAULT_CELL_VALUE)
 
-    attr = nested_getattr(obj, name, None, sep="__")
-    if isinstance(attr, bool):
-        return attr
-
-    if model and (field := get_model_field(model, name)):
-        if (
-            isinstance(attr, datetime.datetime)
-            and type(field) in app_settings.TIME_FORMATS
-        ):
-            attr = jdatetime.datetime.fromgregorian(datetime=attr).strftime(
-                app_settings.TIME_FORMATS[type(field)]
-            )
-        elif (
-            isinstance(attr, jdatetime.datetime)
-            and type(field) in app_settings.TIME_FORMATS
-        ):
-            attr = attr.strftime(app_settings.TIME_FORMATS[type(field)])
-        elif getattr(field, "one_to_many") or getattr(field, "many_to_many"):
-            attr = ", ".join(map(str, methodcaller("all")(attrgetter(name)(obj))))
-        elif field.choices:
-            attr = getattr(obj, f"get_{field.name}_display", lambda: attr)()
-        elif isinstance(field, money_fields.MoneyField):
-            attr = str(attrgetter(name)(obj))
-        elif isinstance(field, (models.FileField, models.ImageField)):
-            attr = FieldFileAbsoluteURL(file=attr, absolute=absolute_url).url
-        elif isinstance(field, PhoneNumberField):
-            attr = str(attr).replace(" ", "-")
-
-    return (attr and str(attr)) or app_settings.DEFAULT_CELL_VALUE
+def get_column_value(obj, name, *, absolute_url=True):
+    """
+    Takes in an object and a column name, and returns the value of the column for the object.
+    Unlike `get_column_cell`, plain values such as numbers, dates and booleans keep their native types,
+    so that typed export formats can write them as-is.
+    """
+    return get_value(obj, name, absolute_url=absolute_url)
 
 
 class ExportXLS(BaseExportFormat):
@@ -591,12 +588,11 @@ class ExportXLS(BaseExportFormat):
         return f"{self.export_filename}{self.format_ext}"
 
     def _apply_cell_style_map(self, style, value):
-        style_map = {k: v for k, v in REPORT_CELL_STYLE_MAP if isinstance(value, k)}
-        for _, cell_style in style_map:
-            return cell_style, (callable(cell_style) and cell_style or (lambda i: i))(
-                value
-            )
-        return style, value
+        if (cell_style := get_cell_styles().get_for_value(value)) is None:
+            return style, value
+        if callable(cell_style):
+            return style, cell_style(value)
+        return cell_style, value
 
     def _default_cell_fn(self, style, value, *args, **kwargs):
         return style, value
@@ -624,9 +620,12 @@ class ExportXLS(BaseExportFormat):
             )
             sheet.write(0, num, value, style)
 
-        for x, obj in enumerate(queryset, start=1):
-            for y, column in enumerate(columns):
-                style, value = default_style, get_column_cell(obj, column)
+        rows = self.iter_export_rows(
+            compile_columns(self.get_export_model(), columns),
+            with_objects="cell_fn" in self.get_export_kwargs(),
+        )
+        for x, (obj, cells) in enumerate(rows, start=1):
+            for y, (column, value) in enumerate(zip(columns, cells)):
                 style, value = self._apply_cell_style_map(default_style, value)
                 style, value = cell_fn(
                     obj=obj, row_number=x, column=column, style=style, value=value
@@ -648,10 +647,159 @@ class ExportXLS(BaseExportFormat):
 export_format.register(ExportXLS)
 
 
+class ExportXlsx(ExportXLS):
+    """
+    Writes the report with xlsxwriter's constant-memory mode, which flushes every row
+    to disk as soon as the next one starts, so memory stays flat regardless of the row count.
+    Values are written with their native types, and rows overflowing a sheet continue on a new one.
+    """
+
+    format_slug = "xlsx"
+    format_name = "Excel (xlsx)"
+    format_ext = ".xlsx"
+    streaming = True
+    max_sheet_rows = 1_048_575
+    sheet_name_max_length = 31
+
+    def _apply_cell_style_map(self, style, value):
+        if isinstance(value, FieldFileAbsoluteURL):
+            return style, value
+        return super()._apply_cell_style_map(style, value)
+
+    def get_max_sheet_rows(self):
+        return self.get_export_kwargs().get("max_sheet_rows", self.max_sheet_rows)
+
+    def _get_sheet_name(self, name, number):
+        name = re.sub(r"[\[\]:*?/\\]", "_", name)
+        if number == 1:
+            return name[: self.sheet_name_max_length]
+
+        suffix = f" ({number})"
+        return f"{name[: self.sheet_name_max_length - len(suffix)]}{suffix}"
+
+    def _get_cell_format(self, workbook, formats, style, **extra):
+        """
+        Translates an xlwt style, as returned by REPORT_CELL_STYLE_MAP or a `cell_fn` hook,
+        into an xlsxwriter format. Formats are cached by their properties and reused across cells.
+        """
+        properties = dict(extra)
+        if style is not None and not callable(style):
+            if (num_format := getattr(style, "num_format_str", "General")) not in ["General", "BOOLEAN"]:
+                properties.setdefault("num_format", num_format)
+            if nested_getattr(style, "font.bold", False):
+                properties["bold"] = True
+            if nested_getattr(style, "font.italic", False):
+                properties["italic"] = True
+
+        if not properties:
+            return None
+
+        key = tuple(sorted(properties.items()))
+        if key not in formats:
+            formats[key] = workbook.add_format(properties)
+        return formats[key]
+
+    def _write_cell(self, sheet, row, col, value, style, workbook, formats):
+        match value:
+            case None:
+                return sheet.write_blank(row, col, None, self._get_cell_format(workbook, formats, style))
+            case bool():
+                return sheet.write_boolean(row, col, value, self._get_cell_format(workbook, formats, style))
+            case Money():
+                cell_format = self._get_cell_format(
+                    workbook, formats, style, num_format=f'#,##0.00 "{value.currency}"'
+                )
+                return sheet.write_number(row, col, value.amount, cell_format)
+            case int() | float() | Decimal():
+                return sheet.write_number(row, col, value, self._get_cell_format(workbook, formats, style))
+            case datetime.datetime() | datetime.date() | datetime.time():
+                if isinstance(value, datetime.datetime) and timezone.is_aware(value):
+                    value = timezone.make_naive(value)
+                return sheet.write_datetime(row, col, value, self._get_cell_format(workbook, formats, style))
+            case FieldFileAbsoluteURL():
+                if not (url := value.url):
+                    return sheet.write_blank(row, col, None)
+                if sheet.write_url(row, col, url, string=url) >= 0:
+                    return
+                return sheet.write_string(row, col, url)
+
+        return sheet.write_string(
+            row, col, str(value).strip("_"), self._get_cell_format(workbook, formats, style)
+        )
+
+    def export(self, output):
+        headers_name = self.get_export_headers()
+        columns = list(headers_name.keys())
+        queryset = self.get_export_qs()
+        max_rows = self.get_max_sheet_rows()
+        cell_fn = self.get_export_kwargs().get("cell_fn", self._default_cell_fn)
+        sheet_name = str(
+            self.get_export_kwargs().get("sheet_name", "default")
+            or nested_getattr(queryset, "model._meta.verbose_name_plural", "sheet")
+        )
+
+        workbook = xlsxwriter.Workbook(
+            output, {"constant_memory": True, "strings_to_urls": False}
+        )
+        default_style = xlwt.XFStyle()
+        formats = {}
+
+        def add_sheet(number):
+            sheet = workbook.add_worksheet(self._get_sheet_name(sheet_name, number))
+            for num, column in enumerate(columns):
+                style, value = default_style, headers_name.get(column, column)
+                if isinstance(column, DynamicSubField):
+                    value = column.get_verbose_name()
+                style, value = cell_fn(
+                    obj=None, row_number=0, column=column, style=style, value=value
+                )
+                sheet.write_string(0, num, str(value), self._get_cell_format(workbook, formats, style))
+            return sheet
+
+        rows = self.iter_export_rows(
+            compile_columns(self.get_export_model(), columns),
+            typed=True,
+            with_objects="cell_fn" in self.get_export_kwargs(),
+        )
+        sheet, sheet_number, x = add_sheet(1), 1, 0
+        for row_number, (obj, values) in enumerate(rows, start=1):
+            if x == max_rows:
+                sheet_number += 1
+                sheet, x = add_sheet(sheet_number), 0
+            x += 1
+
+            for y, (column, value) in enumerate(zip(columns, values)):
+                style, value = self._apply_cell_style_map(default_style, value)
+                style, value = cell_fn(
+                    obj=obj, row_number=row_number, column=column, style=style, value=value
+                )
+                self._write_cell(sheet, x, y, value, style, workbook, formats)
+
+        workbook.close()
+        return output
+
+    def handle(self, output):
+        return self.export(output)
+
+    def iter_chunks(self):
+        return self.iter_file_chunks(self.handle)
+
+    def handle_response(self, response, *args, **kwargs):
+        for chunk in self.iter_chunks():
+            response.write(chunk)
+        return response
+
+
+export_format.register(ExportXlsx)
+
+
 class ExportCsv(BaseExportFormat):
     format_slug = "csv"
     format_name = "CSV"
     format_ext = ".csv"
+    streaming = True
+    compressible = True
+    shardable = True
 
     def get_export_filename(self):
         qs = self.get_export_qs()
@@ -661,40 +809,381 @@ class ExportCsv(BaseExportFormat):
 
         return f"{self.export_filename}{self.format_ext}"
 
-    def export(self):
+    def iter_chunks(self):
         headers_name = self.get_export_headers()
         columns = headers_name.keys()
-        queryset = self.get_export_qs()
+        chunk_size = self.get_chunk_size()
 
-        ()
         output = io.StringIO()
         writer = csv.writer(output)
-        writer.writerow([headers_name.get(column, column) for column in columns])
-        writer.writerows(
-            [[get_column_cell(obj, column) for column in columns] for obj in queryset]
-        )
+
+        def flush():
+            chunk = output.getvalue()
+            output.seek(0)
+            output.truncate()
+            return chunk.encode("utf-8")
+
+        if self.include_header:
+            writer.writerow([headers_name.get(column, column) for column in columns])
+            yield flush()
+
+        rows = self.iter_export_rows(compile_columns(self.get_export_model(), columns))
+        for num, (_, cells) in enumerate(rows, start=1):
+            writer.writerow(cells)
+            if num % chunk_size == 0:
+                yield flush()
+
+        if output.tell():
+            yield flush()
+
+    def export(self):
+        output = io.StringIO()
+        for chunk in self.iter_chunks():
+            output.write(chunk.decode("utf-8"))
         return output
 
     def handle(self, *args, **kwargs):
         return self.export()
 
     def handle_response(self, response, *args, **kwargs):
-        buff = self.handle(*args, **kwargs)
-        response.write(buff.getvalue())
+        for chunk in self.iter_chunks():
+            response.write(chunk)
         return response
 
 
 export_format.register(ExportCsv)
 
 
-def queryset_to_df(queryset, columns, headers):
+class ExportJsonLines(BaseExportFormat):
+    """
+    Streams one JSON object per row, keyed by column title, with the native values of the columns
+    serialized by `ObjectEncoder`. orjson is used as the encoder backend when it's installed.
+    """
+
+    format_slug = "jsonl"
+    format_name = "JSON Lines"
+    format_ext = ".jsonl"
+    streaming = True
+    compressible = True
+    shardable = True
+
+    def get_export_filename(self):
+        qs = self.get_export_qs()
+        if not self.export_filename and isinstance(qs, QuerySet):
+            with override("en"):
+                return f"{qs.model._meta.verbose_name_plural}{self.format_ext}"
+
+        return f"{self.export_filename}{self.format_ext}"
+
+    def get_row_key(self, column):
+        if isinstance(column, DynamicSubField):
+            return column.slug or column.get_verbose_name()
+        return str(column)
+
+    def get_json_dumps(self):
+        """Returns a callable that serializes a row into UTF-8 encoded JSON."""
+        encoder = ObjectEncoder(ensure_ascii=False)
+        if orjson is not None:
+            # dataclasses such as FieldFileAbsoluteURL are left to the encoder
+            return lambda row: orjson.dumps(
+                row, default=encoder.default, option=orjson.OPT_PASSTHROUGH_DATACLASS
+            )
+        return lambda row: encoder.encode(row).encode("utf-8")
+
+    def iter_chunks(self):
+        columns = list(self.get_export_headers().keys())
+        keys = [self.get_row_key(column) for column in columns]
+        dumps = self.get_json_dumps()
+        chunk_size = self.get_chunk_size()
+
+        lines = []
+        rows = self.iter_export_rows(compile_columns(self.get_export_model(), columns), typed=True)
+        for _, values in rows:
+            lines.append(dumps(dict(zip(keys, values))))
+            if len(lines) == chunk_size:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+
+        if lines:
+            yield b"\n".join(lines) + b"\n"
+
+    def handle(self, *args, **kwargs):
+        return b"".join(self.iter_chunks())
+
+    def handle_response(self, response, *args, **kwargs):
+        for chunk in self.iter_chunks():
+            response.write(chunk)
+        return response
+
+
+export_format.register(ExportJsonLines)
+
+
+def get_arrow_type(field):
+    """
+    Returns the Arrow type of the native values the column compiler produces for `field`.
+    Choices become a dictionary of their labels, and anything without a native Arrow
+    counterpart (relations, properties, money, files, jalali dates) is exported as a string.
+    """
+    if field is None or field.is_relation:
+        return pa.string()
+    if field.choices:
+        return pa.dictionary(pa.int32(), pa.string())
+
+    match field:
+        case money_fields.MoneyField() | jmodels.jDateField() | jmodels.jDateTimeField():
+            return pa.string()
+        case models.BooleanField():
+            return pa.bool_()
+        case models.IntegerField():
+            return pa.int64()
+        case models.FloatField():
+            return pa.float64()
+        case models.DecimalField() if field.max_digits:
+            decimal_type = pa.decimal128 if field.max_digits <= 38 else pa.decimal256
+            return decimal_type(field.max_digits, field.decimal_places or 0)
+        case models.DateTimeField():
+            return pa.timestamp("us", tz="UTC" if settings.USE_TZ else None)
+        case models.DateField():
+            return pa.date32()
+        case models.TimeField():
+            return pa.time64("us")
+        case models.DurationField():
+            return pa.duration("us")
+    return pa.string()
+
+
+def _to_arrow_string(value):
+    if value is None:
+        return None
+    if isinstance(value, FieldFileAbsoluteURL):
+        return value.url or None
+    return str(value)
+
+
+def get_arrow_converter(field, arrow_type):
+    """Returns a callable that turns a list of native column values into an Arrow array of `arrow_type`."""
+    if pa.types.is_dictionary(arrow_type):
+        labels = list(dict.fromkeys(str(label) for _, label in field.flatchoices))
+        indices = {label: index for index, label in enumerate(labels)}
+        dictionary = pa.array(labels, type=arrow_type.value_type)
+        # The dictionary is the same for every chunk, which the IPC file format requires.
+        return lambda values: pa.DictionaryArray.from_arrays(
+            pa.array(
+                [None if value is None else indices.get(str(value)) for value in values],
+                type=arrow_type.index_type,
+            ),
+            dictionary,
+        )
+
+    if pa.types.is_string(arrow_type):
+        return lambda values: pa.array(list(map(_to_arrow_string, values)), type=arrow_type)
+    return lambda values: pa.array(values, type=arrow_type)
+
+
+class ExportArrowBase(BaseExportFormat):
+    """
+    Base of the columnar export formats. Rows are extracted a chunk at a time,
+    each column is converted into an Arrow array typed after its model field,
+    and every chunk is written as a record batch, so memory stays bounded by the chunk size.
+    """
+
+    streaming = True
+
+    def get_export_filename(self):
+        qs = self.get_export_qs()
+        if not self.export_filename and isinstance(qs, QuerySet):
+            with override("en"):
+                return f"{qs.model._meta.verbose_name_plural}{self.format_ext}"
+
+        return f"{self.export_filename}{self.format_ext}"
+
+    def get_arrow_field_names(self, headers_name, compiled_columns):
+        """
+        Returns the header labels of the columns as field names.
+        Labels aren't unique, like the names of two related models, so repeated ones get a suffix
+        as fields are looked up by name when the file is read.
+        """
+        names = []
+        for column in compiled_columns:
+            label = name = str(
+                column.name.get_verbose_name()
+                if isinstance(column.name, DynamicSubField)
+                else headers_name.get(column.name, column.name)
+            )
+            suffix = 0
+            while name in names:
+                suffix += 1
+                name = f"{label}_{suffix}"
+            names.append(name)
+        return names
+
+    def get_arrow_schema(self, headers_name, compiled_columns):
+        return pa.schema(
+            [
+                pa.field(name, get_arrow_type(column.field))
+                for name, column in zip(self.get_arrow_field_names(headers_name, compiled_columns), compiled_columns)
+            ]
+        )
+
+    def open_writer(self, output, schema):
+        raise NotImplementedError
+
+    def export(self, output):
+        headers_name = self.get_export_headers()
+        compiled_columns = compile_columns(self.get_export_model(), list(headers_name.keys()))
+        schema = self.get_arrow_schema(headers_name, compiled_columns)
+        converters = [
+            get_arrow_converter(column.field, schema_field.type)
+            for column, schema_field in zip(compiled_columns, schema)
+        ]
+
+        with self.open_writer(output, schema) as writer:
+            for chunk in self.iter_export_columns(compiled_columns):
+                writer.write_batch(
+                    pa.record_batch(
+                        [convert(values) for convert, values in zip(converters, chunk)],
+                        schema=schema,
+                    )
+                )
+        return output
+
+    def handle(self, output):
+        return self.export(output)
+
+    def iter_chunks(self):
+        return self.iter_file_chunks(self.handle)
+
+    def handle_response(self, response, *args, **kwargs):
+        for chunk in self.iter_chunks():
+            response.write(chunk)
+        return response
+
+
+class ExportParquet(ExportArrowBase):
+    format_slug = "parquet"
+    format_name = "Parquet"
+    format_ext = ".parquet"
+    compression = "snappy"
+
+    def open_writer(self, output, schema):
+        return pq.ParquetWriter(
+            output,
+            schema,
+            compression=self.get_export_kwargs().get("parquet_compression", self.compression),
+        )
+
+
+class ExportArrow(ExportArrowBase):
+    format_slug = "arrow"
+    format_name = "Arrow IPC"
+    format_ext = ".arrow"
+
+    def open_writer(self, output, schema):
+        return pa.ipc.new_file(output, schema)
+
+
+if pa is not None:
+    export_format.register(ExportParquet)
+    export_format.register(ExportArrow)
+
+
+def _get_format_key(value):
+    # equal values aren't always formatted alike, like `1` and `True`, or `Decimal("1.5")` and `Decimal("1.50")`
+    if isinstance(value, (float, Decimal)):
+        return type(value), str(value)
+    return type(value), value
+
+
+def _format_df_column(values, format_many, index):
+    """
+    Formats a column of raw values by formatting each of its unique values once
+    and taking the results by position. Unhashable values are formatted one by one.
+    """
+    series = pd.Series(values, index=index, dtype=object)
+    if format_many is None:
+        return series
+
+    try:
+        codes, _ = pd.factorize(pd.Series([_get_format_key(value) for value in series], dtype=object))
+    except TypeError:
+        return pd.Series(format_many(values), index=index, dtype=object)
+    # codes are numbered in order of appearance, so the first occurrences line up with them
+    uniques = series[~pd.Index(codes).duplicated()].tolist()
+    formatted = pd.Series(format_many(uniques), dtype=object).to_numpy()
+    return pd.Series(formatted[codes], index=index, dtype=object)
+
+
+def _get_df_dtype(field):
+    if field is not None and not field.is_relation and field.choices:
+        return pd.CategoricalDtype(list(dict.fromkeys(str(label) for _, label in field.flatchoices)))
+    return None
+
+
+def iter_queryset_dfs(queryset, columns, headers, *, formatted=True, chunk_size=2000):
+    """
+    Yields the report of `queryset` as DataFrames of at most `chunk_size` rows.
+    Raw values are fetched per column, with a single `values_list` query when every column
+    is a plain database field, and each column is formatted by mapping its unique values.
+    With `formatted`, cells are the display strings the other exports write,
+    otherwise they keep their native dtypes, and choice columns become categoricals.
+    """
     header = ["#", *headers]
-    data = []
-    for i, obj in enumerate(queryset):
-        data.append([str(i + 1), *[get_column_cell(obj, col) for col in columns]])
+    model = queryset.model if isinstance(queryset, QuerySet) else None
+    compiled_columns = compile_columns(model, columns)
+
+    if model and (paths := get_values_paths(compiled_columns)):
+        rows = queryset.values_list(*paths).iterator(chunk_size=chunk_size)
+        getters = None
+    else:
+        if model and issubclass(queryset._iterable_class, ModelIterable):
+            select_related, prefetch_related = get_related_lookups(model, columns)
+            queryset = queryset.select_related(*select_related).prefetch_related(*prefetch_related)
+        rows = queryset.iterator(chunk_size=chunk_size) if model else iter(queryset)
+        getters = [
+            column.accessor or (column.cell if formatted else column.value)
+            for column in compiled_columns
+        ]
 
-    df = pd.DataFrame(data, columns=header)
-    return df
+    formatters = [
+        (
+            column.format_cells
+            if formatted
+            else lambda values, format_value=column.format_value: list(map(format_value, values))
+        )
+        if column.accessor
+        else None
+        for column in compiled_columns
+    ]
+    dtypes = [None if formatted else _get_df_dtype(column.field) for column in compiled_columns]
+
+    start = 0
+    while chunk := list(islice(rows, chunk_size)):
+        index = pd.RangeIndex(start, start + len(chunk))
+        values = zip(*chunk) if getters is None else ([get(obj) for obj in chunk] for get in getters)
+
+        data = [pd.Series(index + 1, index=index).astype(str if formatted else "int64")]
+        for column_values, format_, dtype in zip(values, formatters, dtypes):
+            series = _format_df_column(column_values, format_, index)
+            if dtype is not None:
+                series = series.map(lambda value: value if value is None else str(value)).astype(dtype)
+            elif not formatted:
+                series = series.infer_objects()
+            data.append(series)
+
+        df = pd.concat(data, axis=1)
+        df.columns = header
+        yield df
+        start += len(chunk)
+
+
+def queryset_to_df(queryset, columns, headers, *, formatted=True, chunk_size=2000):
+    dfs = list(
+        iter_queryset_dfs(queryset, columns, headers, formatted=formatted, chunk_size=chunk_size)
+    )
+    if not dfs:
+        return pd.DataFrame(columns=["#", *headers])
+    return pd.concat(dfs)
 
 
 def get_report_filename(template):
@@ -5,6 +5,9 @@ from .defaults.views import (
     ColumnDeleteView,
     ColumnListView,
     ColumnUpdateView,
+    ExportJobCreateView,
+    ExportJobDetailView,
+    ExportJobDownloadView,
     GeneralQuerySetExportView,
     ReportExportView,
     ReportView,
@@ -60,3 +63,12 @@ general_qs_export_view = GeneralQuerySetExportView.as_view()
 
 
 report_export_view = ReportExportView.as_view()
+
+
+export_job_create_view = ExportJobCreateView.as_view()
+
+
+export_job_detail_view = ExportJobDetailView.as_view()
+
+
+export_job_download_view = ExportJobDownloadView.as_view()
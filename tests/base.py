@@ -0,0 +1,62 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from flex_report.models import Column, Template
+
+from .models import City, Customer, Order, Tag
+
+
+class ReportTestCase(TestCase):
+    columns = [
+        ("customer__name", True),
+        ("customer__city__name", False),
+        ("amount", False),
+        ("status", True),
+        ("created", False),
+        ("is_paid", False),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser("admin", "admin@example.com", "admin")
+        cls.cities = [City.objects.create(name=name) for name in ["tehran", "shiraz"]]
+        cls.tags = [Tag.objects.create(name=name) for name in ["gold", "silver", "bronze"]]
+        cls.customers = []
+        for i in range(6):
+            customer = Customer.objects.create(name=f"customer {i}", city=cls.cities[i % 2] if i % 3 else None)
+            # customers have none, one or two tags, so joining them repeats some orders
+            customer.tags.set(cls.tags[: i % 3])
+            cls.customers.append(customer)
+
+        created = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        cls.orders = Order.objects.bulk_create(
+            Order(
+                customer=cls.customers[i % 6],
+                amount=i * 10,
+                status=Order.Status.done if i % 2 else Order.Status.new,
+                created=created + datetime.timedelta(hours=i),
+                day=None if i % 4 == 0 else (created + datetime.timedelta(days=i % 5)).date(),
+                is_paid=bool(i % 3),
+            )
+            for i in range(30)
+        )
+
+        cls.content_type = ContentType.objects.get_for_model(Order)
+        cls.template = Template.objects.create(
+            title="orders",
+            model=cls.content_type,
+            creator=cls.user,
+            status=Template.Status.complete,
+        )
+        cls.template.columns.add(
+            *[
+                Column.objects.create(title=title, model=cls.content_type, searchable=searchable)
+                for title, searchable in cls.columns
+            ]
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
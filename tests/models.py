@@ -0,0 +1,49 @@
+from django.db import models
+
+from flex_report import report_model
+
+
+class City(models.Model):
+    name = models.CharField(max_length=50)
+    modified = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=50)
+
+    def __str__(self):
+        return self.name
+
+
+class Customer(models.Model):
+    name = models.CharField(max_length=50)
+    city = models.ForeignKey(City, on_delete=models.CASCADE, null=True)
+    tags = models.ManyToManyField(Tag, blank=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
+
+@report_model.register
+class Order(models.Model):
+    class Status(models.TextChoices):
+        new = "n", "New"
+        done = "d", "Done"
+
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name="orders")
+    amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    status = models.CharField(max_length=1, choices=Status.choices, default=Status.new)
+    created = models.DateTimeField()
+    day = models.DateField(null=True)
+    is_paid = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ["-created"]
+
+    @classmethod
+    def flex_report_search_fields(cls):
+        return ["customer", "customer__name", "customer__tags", "amount", "status", "created", "is_paid"]
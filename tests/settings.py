@@ -0,0 +1,25 @@
+import os
+
+from conf.settings import *  # noqa: F401, F403
+from conf.settings import INSTALLED_APPS
+
+INSTALLED_APPS = INSTALLED_APPS + [
+    "django.contrib.sites",
+    "djmoney",
+    "tests",
+]
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("DB_NAME", "django_flex_report"),
+        "USER": os.environ.get("DB_USER", "django_flex_report"),
+        "PASSWORD": os.environ.get("DB_PASSWORD", "django-flex-report"),
+        "HOST": os.environ.get("DB_HOST", "localhost"),
+        "PORT": os.environ.get("DB_PORT", "5432"),
+    }
+}
+
+ROOT_URLCONF = "tests.urls"
+SITE_ID = 1
+MEDIA_ROOT = os.path.join(os.path.dirname(__file__), "media")
@@ -0,0 +1,52 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from flex_report.cache import get_data_marker
+from flex_report.models import Column, ExportCacheEntry
+
+from .base import ReportTestCase
+from .models import City, Customer
+
+
+class DataMarkerTests(ReportTestCase):
+    def test_indexed_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            marker = get_data_marker(City)
+        self.assertEqual(set(marker), {"pk__max", "modified"})
+        self.assertEqual(len(queries), 1)
+
+    def test_unindexed_fields(self):
+        self.assertEqual(get_data_marker(Customer), {"pk__max": self.customers[-1].pk})
+
+
+@override_settings(REPORT_EXPORT_CACHE_ENABLED=True)
+class ExportCacheTests(ReportTestCase):
+    columns = [("amount", False), ("customer__name", True)]
+
+    def export(self):
+        response = self.client.get(reverse("flex_report:template:export", args=[self.template.pk]), {"format": "csv"})
+        return b"".join(response.streaming_content if response.streaming else [response.content]).decode()
+
+    def test_cached(self):
+        first = self.export()
+        self.assertEqual(ExportCacheEntry.objects.count(), 1)
+        self.assertEqual(self.export(), first)
+        self.assertEqual(ExportCacheEntry.objects.get().hits, 1)
+
+    def test_column_with_the_same_label(self):
+        customers = self.export()
+        self.assertIn("customer 1", customers)
+
+        # both columns are labeled "name", and the template's modified date stays the same
+        modified_date = self.template.modified_date
+        self.template.columns.remove(Column.objects.get(title="customer__name"))
+        self.template.columns.add(Column.objects.create(title="customer__city__name", model=self.content_type))
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.modified_date, modified_date)
+
+        cities = self.export()
+        self.assertNotEqual(cities, customers)
+        self.assertIn("tehran", cities)
+        self.assertEqual(ExportCacheEntry.objects.count(), 2)
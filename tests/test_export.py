@@ -0,0 +1,66 @@
+import io
+from decimal import Decimal
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from flex_report.utils import _format_df_column
+
+from .base import ReportTestCase
+from .models import Order
+
+
+class ArrowExportTests(ReportTestCase):
+    def export(self, format_):
+        response = self.client.get(reverse("flex_report:template:export", args=[self.template.pk]), {"format": format_})
+        self.assertEqual(response.status_code, 200)
+        return io.BytesIO(b"".join(response.streaming_content))
+
+    def assertRoundTrip(self, table):
+        # the customer's and the city's names are both labeled "name"
+        self.assertEqual(table.column_names, ["name", "name_1", "amount", "status", "created", "is paid"])
+        self.assertEqual(table.num_rows, Order.objects.count())
+        self.assertEqual(
+            table.select(["name", "name_1"]).to_pylist(),
+            [
+                {"name": order.customer.name, "name_1": getattr(order.customer.city, "name", None)}
+                for order in Order.objects.select_related("customer__city")
+            ],
+        )
+
+    def test_parquet_round_trip(self):
+        self.assertRoundTrip(pq.read_table(self.export("parquet")))
+
+    def test_arrow_round_trip(self):
+        self.assertRoundTrip(pa.ipc.open_file(self.export("arrow")).read_all())
+
+
+class FormatDataFrameColumnTests(SimpleTestCase):
+    def format_column(self, values):
+        formatted = []
+
+        def format_many(values):
+            formatted.extend(values)
+            return [repr(value) for value in values]
+
+        return _format_df_column(values, format_many, pd.RangeIndex(len(values))).tolist(), len(formatted)
+
+    def test_unique_values_formatted_once(self):
+        self.assertEqual(self.format_column(["a", "b", "a", None, "b"]), (["'a'", "'b'", "'a'", "None", "'b'"], 3))
+
+    def test_equal_values(self):
+        for values in (
+            [1, True, 1.0, True],
+            [Decimal("1.5"), Decimal("1.50")],
+            [1.0, float("nan"), None, 1.0],
+            [0.0, -0.0],
+        ):
+            with self.subTest(values=values):
+                self.assertEqual(self.format_column(values)[0], list(map(repr, values)))
+
+    def test_unhashable_values(self):
+        values = [[1], {"a": 1}, [1]]
+        self.assertEqual(self.format_column(values)[0], list(map(repr, values)))
@@ -0,0 +1,72 @@
+import datetime
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from flex_report import export_format
+from flex_report.jobs import claim_export_job, enqueue_export_job, run_export_job
+from flex_report.models import ExportJob, Template
+
+from .base import ReportTestCase
+
+
+class ExportJobTests(ReportTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("flex_report:template:export_job", args=[self.template.pk])
+
+    def test_create(self):
+        self.assertEqual(self.client.get(self.url, {"format": "csv"}).status_code, 405)
+
+        response = self.client.post(self.url, {"format": "csv", "search": "customer 1"})
+        self.assertEqual(response.status_code, 200)
+        job = ExportJob.objects.get()
+        self.assertEqual(job.creator, self.user)
+        self.assertEqual((job.export_format, job.query_params), ("csv", {"search": ["customer 1"]}))
+
+        run_export_job(claim_export_job())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.row_count), (ExportJob.Status.complete, 5))
+
+    def test_create_refused(self):
+        Template.objects.filter(pk=self.template.pk).update(status=Template.Status.pending)
+        self.assertEqual(self.client.post(self.url, {"format": "csv"}).status_code, 404)
+
+        Template.objects.filter(pk=self.template.pk).update(status=Template.Status.complete)
+        with mock.patch.object(export_format.formats["csv"], "check_auth", return_value=False):
+            self.assertEqual(self.client.post(self.url, {"format": "csv"}).status_code, 403)
+        self.assertFalse(ExportJob.objects.exists())
+
+    def test_run_refused(self):
+        job = enqueue_export_job(self.template, self.user, "csv")
+        with mock.patch.object(export_format.formats["csv"], "check_auth", return_value=False):
+            run_export_job(claim_export_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.failed)
+        self.assertIn("PermissionDenied", job.error)
+
+        job = enqueue_export_job(self.template, self.user, "csv")
+        Template.objects.filter(pk=self.template.pk).update(status=Template.Status.pending)
+        run_export_job(claim_export_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.failed)
+        self.assertIn("Http404", job.error)
+
+    def test_run_without_creator(self):
+        job = enqueue_export_job(self.template, self.user, "csv")
+        ExportJob.objects.filter(pk=job.pk).update(creator=None)
+        run_export_job(claim_export_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.failed)
+        self.assertFalse(job.file)
+
+    @override_settings(REPORT_EXPORT_JOB_TIMEOUT=60)
+    def test_claim_stale_jobs(self):
+        job = enqueue_export_job(self.template, self.user, "csv")
+        self.assertEqual(claim_export_job(), job)
+        self.assertIsNone(claim_export_job())
+
+        ExportJob.objects.filter(pk=job.pk).update(started=timezone.now() - datetime.timedelta(minutes=2))
+        self.assertEqual(claim_export_job(), job)
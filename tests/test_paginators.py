@@ -0,0 +1,89 @@
+import html
+import re
+
+from django.test import override_settings
+from django.urls import reverse
+
+from flex_report.paginators import InvalidCursor, KeysetPaginator, encode_cursor, get_keyset_ordering, get_paginator
+
+from .base import ReportTestCase
+from .models import Order
+
+
+class KeysetPaginatorTests(ReportTestCase):
+    def test_pages_cover_every_row(self):
+        paginator = KeysetPaginator(Order.objects.all(), 7)
+        page, rows = paginator.page(), []
+        while True:
+            rows.extend(page)
+            if not page.has_next():
+                break
+            page = paginator.page(page.next_cursor)
+        self.assertEqual(rows, list(Order.objects.all()))
+
+    def test_wrong_typed_cursor(self):
+        paginator = KeysetPaginator(Order.objects.order_by("pk"), 7)
+        with self.assertRaises(InvalidCursor):
+            paginator.page(encode_cursor(["abc"]))
+
+        paginator = KeysetPaginator(Order.objects.all(), 7)
+        for values in (["abc", 1], [["2024-01-01"], 1], ["2024-01-01T00:00:00+00:00", "abc"]):
+            with self.subTest(values=values), self.assertRaises(InvalidCursor):
+                paginator.page(encode_cursor(values))
+
+    @override_settings(REPORT_PAGINATION_MODE="keyset")
+    def test_wrong_typed_cursor_shows_first_page(self):
+        response = self.client.get(
+            reverse("flex_report:view", args=[self.template.pk]), {"report_page": encode_cursor(["abc", "abc"])}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["pagination"]["mode"], "keyset")
+        self.assertEqual(list(response.context["pagination"]["qs"]), list(Order.objects.all()[:25]))
+
+    def test_nullable_ordering(self):
+        for ordering in ("day", "-day", "customer__city__name"):
+            with self.subTest(ordering=ordering):
+                queryset = Order.objects.order_by(ordering)
+                self.assertIsNone(get_keyset_ordering(queryset))
+                self.assertEqual(get_paginator(queryset, 7, "keyset").mode, "offset")
+
+        self.assertEqual(get_paginator(Order.objects.order_by("customer__name"), 7, "keyset").mode, "keyset")
+
+
+class CountlessPaginatorTests(ReportTestCase):
+    def test_indexes_without_counting(self):
+        paginator = get_paginator(Order.objects.all(), 7, "countless")
+        page = paginator.page(2)
+        with self.assertNumQueries(0):
+            self.assertEqual((page.start_index(), page.end_index()), (8, 14))
+
+        page = paginator.page(5)
+        with self.assertNumQueries(0):
+            self.assertEqual((page.start_index(), page.end_index()), (29, 30))
+            self.assertFalse(page.has_next())
+
+
+@override_settings(REPORT_PAGINATION_MODE="keyset")
+class KeysetPaginationTemplateTests(ReportTestCase):
+    def test_follow_links(self):
+        url = reverse("flex_report:view", args=[self.template.pk])
+        response = self.client.get(url, {"report_per_page": 25})
+        self.assertContains(response, "keyset-pagination")
+        self.assertNotContains(response, "Previous</a>")
+        rows = list(response.context["pagination"]["qs"])
+
+        next_link = re.search(r'href="\?([^"]+)">Next</a>', response.content.decode())
+        response = self.client.get(f"{url}?{html.unescape(next_link[1])}")
+        rows.extend(response.context["pagination"]["qs"])
+        self.assertNotContains(response, "Next</a>")
+        self.assertEqual(rows, list(Order.objects.all()))
+
+        previous_link = re.search(r'href="\?([^"]+)">Previous</a>', response.content.decode())
+        response = self.client.get(f"{url}?{html.unescape(previous_link[1])}")
+        self.assertEqual(list(response.context["pagination"]["qs"]), rows[:25])
+
+    @override_settings(REPORT_PAGINATION_MODE="offset")
+    def test_numbered_pages(self):
+        response = self.client.get(reverse("flex_report:view", args=[self.template.pk]))
+        self.assertContains(response, "report_page=2")
+        self.assertNotContains(response, "keyset-pagination")
@@ -0,0 +1,45 @@
+from unittest import mock
+
+from django.urls import reverse
+
+from flex_report.utils import get_model_filters
+
+from .base import ReportTestCase
+
+
+class QueryBudgetTests(ReportTestCase):
+    """
+    The queries of a request don't depend on the number of rows or columns.
+    Both budgets include the session, the user and the template with its content type.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # builds the plan of the template
+        self.client.get(reverse("flex_report:view", args=[self.template.pk]))
+
+    def test_report_page(self):
+        url = reverse("flex_report:view", args=[self.template.pk])
+        for params in ({}, {"search": "customer 1"}):
+            # columns, the counts of the paginator and the buttons, dynamic columns and the page
+            with self.subTest(params=params), self.assertNumQueries(10):
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+
+    def test_export(self):
+        url = reverse("flex_report:template:export", args=[self.template.pk])
+        for params, count in (({}, 30), ({"search": "customer 1"}, 5)):
+            # columns and the rows
+            with self.subTest(params=params), self.assertNumQueries(7):
+                response = self.client.get(url, {"format": "csv", **params})
+                rows = b"".join(response.streaming_content).splitlines()
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(rows), count + 1)
+
+    def test_filtersets_built_once(self):
+        url = reverse("flex_report:view", args=[self.template.pk])
+        # the filtersets of the model were built by the first request, in `setUp`
+        with mock.patch("flex_report.filterset.get_model_filters", wraps=get_model_filters) as build:
+            response = self.client.get(url, {"search": "customer 1", "status": "d"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(build.call_count, 0)
@@ -0,0 +1,79 @@
+from django.db.models import Q
+
+from flex_report.filterset import generate_filterset_from_model, generate_quicksearch_filterset_from_model
+from flex_report.query import compile_report_qs
+
+from .base import ReportTestCase
+from .models import Order
+
+
+class CompileReportQuerySetTests(ReportTestCase):
+    """`compile_report_qs` returns the rows the DISTINCT and `pk__in` composition it replaced did, once each."""
+
+    searchable_fields = ["customer__name", "status"]
+
+    def get_filtersets(self, template_data, request_data, search):
+        filterset_class = generate_filterset_from_model(Order)
+        quicksearch_class = generate_quicksearch_filterset_from_model(Order, self.searchable_fields)
+        template = filterset_class(template_data or {}) if template_data else None
+        return template, quicksearch_class({"search": search} if search else {}), filterset_class(request_data or {})
+
+    def get_distinct_join_qs(self, template_data=None, request_data=None, search=None, condition=None):
+        template, quicksearch, filters = self.get_filtersets(template_data, request_data, search)
+        report_qs = template.qs.distinct() if template else Order.objects.all()
+        if condition:
+            report_qs = report_qs.filter(condition).distinct()
+        if (quicksearch.data and quicksearch.is_valid()) or (filters.data and filters.is_valid()):
+            request_qs = quicksearch.qs.distinct() & filters.qs.distinct()
+            report_qs = report_qs.distinct().filter(pk__in=request_qs.values("pk"))
+        return report_qs
+
+    def get_compiled_qs(self, template_data=None, request_data=None, search=None, condition=None):
+        template, quicksearch, filters = self.get_filtersets(template_data, request_data, search)
+        return compile_report_qs(
+            Order.objects.all(),
+            filtersets=[f for f in (template, quicksearch, filters) if f is not None],
+            conditions=[condition or Q()],
+        )
+
+    def assertSameRows(self, **kwargs):
+        expected = list(self.get_distinct_join_qs(**kwargs).values_list("pk", flat=True))
+        compiled = self.get_compiled_qs(**kwargs)
+        pks = list(compiled.values_list("pk", flat=True))
+        self.assertCountEqual(pks, expected)
+        self.assertEqual(len(pks), len(set(pks)))
+        self.assertNotIn("DISTINCT", str(compiled.query))
+        return pks
+
+    def test_to_one_filters(self):
+        pks = self.assertSameRows(request_data={"status": Order.Status.done, "customer": [self.customers[1].pk]})
+        self.assertTrue(pks)
+        self.assertSameRows(template_data={"customer__name": "customer 2"}, request_data={"is_paid": "true"})
+
+    def test_to_many_filters(self):
+        gold, silver, _ = self.tags
+        # customers having both tags would repeat their orders when joined
+        pks = self.assertSameRows(request_data={"customer__tags": [gold.pk, silver.pk]})
+        self.assertEqual(len(pks), Order.objects.filter(customer__tags__in=[gold, silver]).distinct().count())
+        self.assertLess(len(pks), Order.objects.filter(customer__tags__in=[gold, silver]).count())
+        self.assertSameRows(template_data={"customer__tags": [silver.pk]})
+        self.assertSameRows(condition=Q(customer__tags__in=[gold, silver]))
+
+    def test_quicksearch(self):
+        self.assertSameRows(search="customer 1")
+        self.assertSameRows(search="d")
+        self.assertSameRows(search="nothing matches")
+
+    def test_combined_filters(self):
+        gold, silver, _ = self.tags
+        self.assertSameRows(
+            template_data={"customer__tags": [gold.pk, silver.pk]},
+            request_data={"status": Order.Status.new},
+            search="customer",
+        )
+        self.assertSameRows(
+            template_data={"status": Order.Status.done},
+            request_data={"customer__tags": [gold.pk, silver.pk], "is_paid": "true"},
+            condition=Q(customer__tags__in=[silver]),
+        )
+        self.assertSameRows(request_data={"customer": [c.pk for c in self.customers[:3]]}, search="customer 2")
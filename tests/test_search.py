@@ -0,0 +1,64 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+
+from flex_report.models import Column, ReportSearchDocument
+from flex_report.search import SearchDocumentQuicksearchBackend, get_search_document_paths, update_search_document
+
+from .base import ReportTestCase
+from .models import Order
+
+
+@override_settings(REPORT_QUICKSEARCH_BACKEND="flex_report.search.SearchDocumentQuicksearchBackend")
+class SearchDocumentTests(ReportTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        call_command("flex_report_rebuild_search_documents", stdout=StringIO())
+
+    def setUp(self):
+        super().setUp()
+        self.backend = SearchDocumentQuicksearchBackend()
+
+    def test_search_documents(self):
+        queryset = self.backend.search(Order.objects.all(), ["status", "customer__name"], "Customer 1")
+        self.assertIn(ReportSearchDocument._meta.db_table, str(queryset.query))
+        self.assertQuerySetEqual(queryset, Order.objects.filter(customer=self.customers[1]), ordered=False)
+
+    def test_across_values(self):
+        # the document of an order holds its customer's name, then its status
+        queryset = self.backend.search(Order.objects.all(), ["status", "customer__name"], "1 d")
+        self.assertFalse(queryset.exists())
+
+    def test_paths_changed_elsewhere(self):
+        self.assertEqual(get_search_document_paths(Order), ("customer__name", "status"))
+        # like another process would, without the signals of this one
+        Column.objects.filter(title="status").update(searchable=False)
+        self.assertEqual(get_search_document_paths(Order), ("customer__name",))
+
+        order = Order.objects.filter(status=Order.Status.done).first()
+        update_search_document(order)
+        self.assertEqual(ReportSearchDocument.objects.get(object_id=str(order.pk)).text, order.customer.name)
+
+    def test_other_fields(self):
+        # the documents hold the customer's name too, which isn't searched here
+        queryset = self.backend.search(Order.objects.all(), ["status"], "customer 1")
+        self.assertNotIn(ReportSearchDocument._meta.db_table, str(queryset.query))
+        self.assertFalse(queryset.exists())
+
+        queryset = self.backend.search(Order.objects.all(), ["customer__city__name"], "tehran")
+        self.assertQuerySetEqual(queryset, Order.objects.filter(customer__city__name="tehran"), ordered=False)
+
+    def test_indexes(self):
+        ((model, index),) = self.backend.get_indexes([])
+        self.assertIs(model, ReportSearchDocument)
+        with connection.schema_editor(collect_sql=True, atomic=False) as schema_editor:
+            sql = str(index.create_sql(model, schema_editor))
+        self.assertIn("USING gin", sql)
+        self.assertIn("gin_trgm_ops", sql)
+
+        out = StringIO()
+        call_command("flex_report_search_indexes", dry_run=True, stdout=out)
+        self.assertIn(f"Would create {index.name} on {model._meta.db_table}.", out.getvalue())